@@ -4,28 +4,13 @@ import shutil
 from datetime import datetime, timedelta
 from pathlib import Path
 from types import SimpleNamespace
-from typing import Callable
-from unittest.mock import patch
 
-import tenacity
 from cryptography import x509
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import rsa
 from cryptography.x509.oid import NameOID
 
 
-def patch_wait_fixed() -> Callable:
-    def _wait_fixed(*args, **kwargs):
-        """Patch for the not-yet-implemented testing backend needed for `wait_fixed`.
-
-        This patch decorator can be used for cases such as:
-        wait_fixed(5)
-        """
-        return tenacity.wait.wait_fixed(0.1)
-
-    return patch("charms.opensearch.v0.opensearch_backups.wait_fixed", _wait_fixed)
-
-
 def copy_file_content_to_tmp(config_dir_path: str, source_path: str) -> str:
     """Copy the content of a file into a temporary file and return it."""
     relative_dir = ""
@@ -1,8 +1,14 @@
 # Copyright 2025 Canonical Ltd.
 # See LICENSE file for licensing details.
 import os
+from typing import Any, Generator
 
 import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+# most requests the tests gather at once against one host (one per unit), each on a connection
+HTTP_POOL_MAXSIZE = 3
 
 
 @pytest.fixture
@@ -29,3 +35,17 @@ def charm(ubuntu_base):
     # juju bundle files expect local charms to begin with `./` or `/` to distinguish them from
     # Charmhub charms.
     return f"./wazuh-indexer_ubuntu@{ubuntu_base}-amd64.charm"
+
+
+@pytest.fixture(scope="session")
+def http_session() -> Generator[requests.Session, Any, None]:
+    """HTTP session shared by the whole suite, to keep connections to the units alive.
+
+    The requests a test gathers are sent through it from worker threads (asyncio.to_thread):
+    only stateless requests may use it, i.e. no cookies nor per-request changes to the session,
+    the connection pools being the only state shared. Each pool is sized for the requests
+    gathered at once, so that no connection is discarded.
+    """
+    with requests.Session() as session:
+        session.mount("https://", HTTPAdapter(pool_maxsize=HTTP_POOL_MAXSIZE))
+        yield session
@@ -6,7 +6,6 @@ import asyncio
 import json
 import logging
 import subprocess
-import time
 from typing import Dict, List, Optional
 
 from charms.opensearch.v0.models import App, Node
@@ -343,7 +342,7 @@ async def cut_network_from_unit_with_ip_change(ops_test: OpsTest, app: str, unit
     cut_network_command = f"lxc config device add {unit_hostname} eth0 none"
     subprocess.check_call(cut_network_command.split())
 
-    time.sleep(5)
+    await asyncio.sleep(5)
 
 
 async def cut_network_from_unit_without_ip_change(
@@ -367,7 +366,7 @@ async def cut_network_from_unit_without_ip_change(
     limit_set_command = f"lxc config device set {unit_hostname} eth0 limits.priority=10"
     subprocess.check_call(limit_set_command.split())
 
-    time.sleep(10)
+    await asyncio.sleep(10)
 
 
 async def restore_network_for_unit_with_ip_change(unit_hostname: str) -> None:
@@ -376,7 +375,7 @@ async def restore_network_for_unit_with_ip_change(unit_hostname: str) -> None:
     restore_network_command = f"lxc config device remove {unit_hostname} eth0"
     subprocess.check_call(restore_network_command.split())
 
-    time.sleep(5)
+    await asyncio.sleep(5)
 
 
 async def restore_network_for_unit_without_ip_change(unit_hostname: str) -> None:
@@ -388,7 +387,7 @@ async def restore_network_for_unit_without_ip_change(unit_hostname: str) -> None
     limit_set_command = f"lxc config device set {unit_hostname} eth0 limits.priority="
     subprocess.check_call(limit_set_command.split())
 
-    time.sleep(10)
+    await asyncio.sleep(10)
 
 
 def is_unit_reachable(from_host: str, to_host: str) -> bool:
@@ -536,7 +535,7 @@ async def assert_start_and_check_continuous_writes(
     )
     writer = ContinuousWrites(ops_test, app, initial_count=initial_count)
     await writer.start()
-    time.sleep(10)
+    await asyncio.sleep(10)
     # Ensure we have writes happening and the index is consistent at the end
     await assert_continuous_writes_increasing(writer)
     await assert_continuous_writes_consistency(ops_test, writer, [app])
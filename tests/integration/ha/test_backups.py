@@ -21,7 +21,6 @@ import os
 import random
 import string
 import subprocess
-import time
 import uuid
 from datetime import datetime
 from typing import Dict
@@ -43,6 +42,7 @@ from ..helpers import (
     APP_NAME,
     CONFIG_OPTS,
     MODEL_CONFIG,
+    forget_admin_secrets,
     get_leader_unit_id,
     get_leader_unit_ip,
     http_request,
@@ -684,6 +684,7 @@ async def test_restore_to_new_cluster(
         ops_test.model.remove_application(app, block_until_done=True),
         ops_test.model.remove_application(TLS_CERTIFICATES_APP_NAME, block_until_done=True),
     )
+    forget_admin_secrets(ops_test)
 
     logging.info("Deploying a new cluster")
     await ops_test.model.set_config(MODEL_CONFIG)
@@ -745,7 +746,7 @@ async def test_restore_to_new_cluster(
     global_cwrites = writer
 
     await writer.start()
-    time.sleep(10)
+    await asyncio.sleep(10)
     date_before_backup = datetime.utcnow()
 
     # Wait, we want to make sure the timestamps are different
@@ -918,7 +919,7 @@ async def test_change_config_and_backup_restore(
         global_cwrites = writer
 
         await writer.start()
-        time.sleep(10)
+        await asyncio.sleep(10)
 
         logger.info(f"Syncing credentials for {cloud_name}")
         config: Dict[str, str] = cloud_configs[cloud_name]
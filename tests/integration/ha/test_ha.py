@@ -4,7 +4,6 @@
 
 import asyncio
 import logging
-import time
 
 import pytest
 from pytest_operator.plugin import OpsTest
@@ -263,7 +262,7 @@ async def test_freeze_db_process_node_with_primary_shard(
     )
 
     # wait until the SIGSTOP fully takes effect
-    time.sleep(10)
+    await asyncio.sleep(10)
 
     # verify the unit is not reachable
     is_node_up = await is_up(ops_test, units_ips[first_unit_with_primary_shard], retries=3)
@@ -346,7 +345,7 @@ async def test_freeze_db_process_node_with_elected_cm(
     )
 
     # wait until the SIGSTOP fully takes effect
-    time.sleep(10)
+    await asyncio.sleep(10)
 
     # verify the unit is not reachable
     is_node_up = await is_up(ops_test, units_ips[first_elected_cm_unit_id], retries=3)
@@ -527,7 +526,7 @@ async def test_full_cluster_crash(
 
     # sleep for restart delay + 45 secs max for the election time + node start + cluster formation
     # around 10 sec enough in a good machine - 45 secs for CI
-    time.sleep(ORIGINAL_RESTART_DELAY + 45)
+    await asyncio.sleep(ORIGINAL_RESTART_DELAY + 45)
 
     # verify all units are up and running
     for unit_id, unit_ip in (await get_application_unit_ids_ips(ops_test, app)).items():
@@ -579,7 +578,7 @@ async def test_full_cluster_restart(
 
     # sleep for restart delay + 45 secs max for the election time + node start + cluster formation
     # around 10 sec enough in a good machine - 45 secs for CI
-    time.sleep(ORIGINAL_RESTART_DELAY + 45)
+    await asyncio.sleep(ORIGINAL_RESTART_DELAY + 45)
 
     # verify all units are up and running
     for unit_id, unit_ip in (await get_application_unit_ids_ips(ops_test, app)).items():
@@ -4,7 +4,6 @@
 
 import asyncio
 import logging
-import time
 
 import pytest
 from charms.opensearch.v0.constants_charm import ClusterHealthYellow
@@ -323,7 +322,7 @@ async def test_safe_scale_down_remove_leaders(
         ), "Primary shard still assigned to destroyed unit."
 
     # check that writes are still going after the removal / p_shard reelection
-    time.sleep(3)
+    await asyncio.sleep(3)
     new_writes = await c_writes.count()
     assert new_writes > writes
 
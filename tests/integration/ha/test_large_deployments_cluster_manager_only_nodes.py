@@ -4,7 +4,6 @@
 
 import asyncio
 import logging
-import time
 
 import pytest
 from charms.opensearch.v0.constants_charm import PClusterNoDataNode, PClusterNoRelation
@@ -124,7 +123,7 @@ async def test_correct_startup_after_integration(ops_test: OpsTest) -> None:
     # make sure data can be written
     c_writes = ContinuousWrites(ops_test, app=DATA_APP)
     await c_writes.start()
-    time.sleep(30)
+    await asyncio.sleep(30)
     await c_writes.stop()
     assert (await c_writes.count()) > 0, "Continuous writes did not increase"
 
@@ -4,7 +4,6 @@
 
 import asyncio
 import logging
-import time
 
 import pytest
 from charms.opensearch.v0.constants_charm import PClusterNoDataNode, PClusterNoRelation
@@ -256,7 +255,7 @@ async def test_cluster_name_inheritence_and_integration(ops_test: OpsTest) -> No
     # make sure data can be written
     c_writes = ContinuousWrites(ops_test, app=DATA_APP_AUTOGEN)
     await c_writes.start()
-    time.sleep(30)
+    await asyncio.sleep(30)
     await c_writes.stop()
     assert (await c_writes.count()) > 0, "Continuous writes did not increase"
 
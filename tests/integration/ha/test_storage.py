@@ -5,7 +5,6 @@
 import asyncio
 import logging
 import subprocess
-import time
 
 import pytest
 from pytest_operator.plugin import OpsTest
@@ -17,7 +16,13 @@ from ..ha.helpers import (
     storage_type,
 )
 from ..ha.test_horizontal_scaling import IDLE_PERIOD
-from ..helpers import APP_NAME, CONFIG_OPTS, MODEL_CONFIG, get_application_unit_ids
+from ..helpers import (
+    APP_NAME,
+    CONFIG_OPTS,
+    MODEL_CONFIG,
+    forget_admin_secrets,
+    get_application_unit_ids,
+)
 from ..helpers_deployments import wait_until
 from ..tls.test_tls import TLS_CERTIFICATES_APP_NAME, TLS_STABLE_CHANNEL
 from .continuous_writes import ContinuousWrites
@@ -171,7 +176,7 @@ async def test_storage_reuse_after_scale_to_zero(
         storage_ids[unit_id] = storage_id(ops_test, app, unit_id)
         await ops_test.model.applications[app].destroy_unit(f"{app}/{unit_id}")
         # give some time for removing each unit
-        time.sleep(60)
+        await asyncio.sleep(60)
 
     # using wait_until doesn't really work well here with 0 units
     await ops_test.model.wait_for_idle(
@@ -206,7 +211,7 @@ async def test_storage_reuse_after_scale_to_zero(
 
     # restart continuous writes and check if they can be written
     await c_writes.start()
-    time.sleep(30)
+    await asyncio.sleep(30)
     await assert_continuous_writes_increasing(c_writes)
 
 
@@ -240,7 +245,7 @@ async def test_storage_reuse_in_new_cluster_after_app_removal(
         )
     else:
         # wait for enough data to be written
-        time.sleep(60)
+        await asyncio.sleep(60)
 
     writes_result = await c_writes.stop()
 
@@ -273,6 +278,7 @@ async def test_storage_reuse_in_new_cluster_after_app_removal(
 
     # remove the remaining unit and the entire application
     await ops_test.model.remove_application(app, block_until_done=True)
+    forget_admin_secrets(ops_test, app=app)
 
     # deploy new cluster, attaching the storage from the previous leader to the new leader
     deploy_cluster_with_storage_cmd = (
@@ -327,5 +333,5 @@ async def test_storage_reuse_in_new_cluster_after_app_removal(
 
     # restart continuous writes and check if they can be written
     await c_writes.start()
-    time.sleep(60)
+    await asyncio.sleep(60)
     assert (await c_writes.count()) > 0, "Continuous writes not increasing"
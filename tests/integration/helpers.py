@@ -1,16 +1,18 @@
 #!/usr/bin/env python3
 # Copyright 2024 Canonical Ltd.
 # See LICENSE file for licensing details.
+import asyncio
 import json
 import logging
 import random
 import shlex
 import subprocess
 import tempfile
+from contextlib import nullcontext
 from hashlib import md5
 from pathlib import Path
 from types import SimpleNamespace
-from typing import Dict, List, Optional, Union
+from typing import IO, Dict, List, Optional, Tuple, Union
 
 import requests
 import yaml
@@ -22,6 +24,7 @@ from tenacity import (
     Retrying,
     retry,
     stop_after_attempt,
+    wait_exponential,
     wait_fixed,
     wait_random,
 )
@@ -53,6 +56,12 @@ MODEL_CONFIG = {
 
 logger = logging.getLogger(__name__)
 
+# admin secrets of each (model uuid, app), dropped by forget_admin_secrets once they change
+_admin_secrets: Dict[Tuple[str, str], Dict[str, str]] = {}
+
+# files holding each CA chain seen, removed once the test run is over
+_ca_chain_files: Dict[str, IO[str]] = {}
+
 
 def model_conf_with_short_update_schedule():
     model_conf = MODEL_CONFIG.copy()
@@ -132,6 +141,9 @@ async def run_action(
     action = await ops_test.model.units.get(unit_name).run_action(action_name, **(params or {}))
     action = await action.wait()
 
+    if action_name == "set-password":
+        forget_admin_secrets(ops_test, app=app)
+
     return SimpleNamespace(status=action.status or "completed", response=action.results)
 
 
@@ -169,6 +181,53 @@ async def get_secrets(
     ).response
 
 
+async def get_admin_secrets(ops_test: OpsTest, app: str = APP_NAME) -> Dict[str, str]:
+    """Retrieve the admin secrets, only running the get-password action if not cached yet.
+
+    Args:
+        ops_test: The ops test framework instance
+        app: the name of the app
+
+    Returns:
+        Dict with the admin and cert chain stored on the peer relation databag.
+    """
+    key = (ops_test.model.uuid, app)
+    secrets = _admin_secrets.get(key)
+    if not secrets:
+        secrets = await get_secrets(ops_test, app=app)
+        # a failed action (e.g. TLS not set up yet) must not be cached
+        if secrets.get("password"):
+            _admin_secrets[key] = secrets
+
+    return secrets
+
+
+def forget_admin_secrets(ops_test: OpsTest, app: Optional[str] = None) -> None:
+    """Drop the cached admin secrets of an app, or of every app of the model if not set.
+
+    To call whenever they change: app removed, admin password set or CA rotated.
+    """
+    for model_uuid, cached_app in list(_admin_secrets):
+        if model_uuid == ops_test.model.uuid and app in (None, cached_app):
+            del _admin_secrets[(model_uuid, cached_app)]
+
+
+def ca_chain_file(ca_chain: str) -> str:
+    """Path of a file holding the CA chain, written once per chain.
+
+    A stable path lets a shared session reuse its pooled (and already verified) connections, as
+    urllib3 keys its connection pools on the CA file.
+    """
+    chain = _ca_chain_files.get(ca_chain)
+    if not chain:
+        chain = tempfile.NamedTemporaryFile(mode="w", suffix=".pem")
+        chain.write(ca_chain)
+        chain.flush()
+        _ca_chain_files[ca_chain] = chain
+
+    return chain.name
+
+
 def get_application_unit_names(ops_test: OpsTest, app: str = APP_NAME) -> List[str]:
     """List the unit names of an application.
 
@@ -342,6 +401,8 @@ async def http_request(
     user_password: Optional[str] = None,
     app: str = APP_NAME,
     json_resp: bool = True,
+    headers: Optional[Dict[str, str]] = None,
+    session: Optional[requests.Session] = None,
 ):
     """Makes an HTTP request.
 
@@ -355,52 +416,55 @@ async def http_request(
         user_password: use alternative password than the admin one in the secrets.
         app: the name of the current application.
         json_resp: return a json response or simply log
+        headers: extra headers to send, an "Authorization" header here replaces basic auth.
+        session: a session to reuse (and keep its connections alive), a new one if not set.
 
     Returns:
         A json object.
     """
-    admin_secrets = await get_secrets(ops_test, app=app)
-
-    # fetch the cluster info from the endpoint of this unit
-    with requests.Session() as session, tempfile.NamedTemporaryFile(mode="w+") as chain:
-        chain.write(admin_secrets["ca-chain"])
-        chain.seek(0)
-
-        logger.info(f"Calling: {method} -- {endpoint}")
-
-        request_kwargs = {
-            "method": method,
-            "url": endpoint,
-            "timeout": (17, 17),
-        }
-        if json_resp:
-            request_kwargs["headers"] = {
+    logger.info(f"Calling: {method} -- {endpoint}")
+
+    request_kwargs = {
+        "method": method,
+        "url": endpoint,
+        "timeout": (17, 17),
+    }
+    request_kwargs["headers"] = dict(headers or {})
+    if json_resp:
+        request_kwargs["headers"].update(
+            {
                 "Accept": "application/json",
                 "Content-Type": "application/json",
             }
+        )
 
-        if isinstance(payload, str):
-            request_kwargs["data"] = payload
-        elif isinstance(payload, dict):
-            request_kwargs["data"] = json.dumps(payload)
+    if isinstance(payload, str):
+        request_kwargs["data"] = payload
+    elif isinstance(payload, dict):
+        request_kwargs["data"] = json.dumps(payload)
 
-        session.auth = (user, user_password or admin_secrets["password"])
+    admin_secrets = await get_admin_secrets(ops_test, app=app)
+    if "Authorization" not in request_kwargs["headers"]:
+        request_kwargs["auth"] = (user, user_password or admin_secrets["password"])
+    request_kwargs["verify"] = ca_chain_file(admin_secrets["ca-chain"]) if verify else False
 
-        request_kwargs["verify"] = chain.name if verify else False
-        resp = session.request(**request_kwargs)
+    # fetch the cluster info from the endpoint of this unit, a given session is left open
+    with nullcontext(session) if session else requests.Session() as http_session:
+        # run the blocking call off the event loop, so concurrent requests do overlap
+        resp = await asyncio.to_thread(http_session.request, **request_kwargs)
 
-        if resp.status_code == 503:
-            logger.debug("\n\n\n\n -- Error 503 -- \n")
-            await debug_failed_unit(ops_test, app, endpoint)
+    if resp.status_code == 503:
+        logger.debug("\n\n\n\n -- Error 503 -- \n")
+        await debug_failed_unit(ops_test, app, endpoint)
 
-        if resp_status_code:
-            return resp.status_code
+    if resp_status_code:
+        return resp.status_code
 
-        if json_resp:
-            return resp.json()
+    if json_resp:
+        return resp.json()
 
-        logger.info(f"\n{resp.text}")
-        return resp
+    logger.info(f"\n{resp.text}")
+    return resp
 
 
 async def debug_failed_unit(ops_test: OpsTest, app: str, endpoint: str) -> None:
@@ -447,19 +511,24 @@ def opensearch_client(
 
 
 @retry(
-    wait=wait_fixed(wait=5) + wait_random(0, 5),
-    stop=stop_after_attempt(15),
+    wait=wait_exponential(multiplier=1, max=30) + wait_random(0, 1),
+    stop=stop_after_attempt(8),
+    reraise=True,
 )
 async def cluster_health(
-    ops_test: OpsTest, unit_ip: str, wait_for_green_first: bool = False
+    ops_test: OpsTest,
+    unit_ip: str,
+    wait_for_green_first: bool = False,
+    session: Optional[requests.Session] = None,
 ) -> Dict[str, any]:
-    """Fetch the cluster health."""
+    """Fetch the cluster health, retrying on transient connection or decoding errors."""
     if wait_for_green_first:
         try:
             return await http_request(
                 ops_test,
                 "GET",
                 f"https://{unit_ip}:9200/_cluster/health?wait_for_status=green&timeout=1m",
+                session=session,
             )
         except requests.HTTPError:
             # it timed out, settle with current status, fetched next without the 1min wait
@@ -469,6 +538,7 @@ async def cluster_health(
         ops_test,
         "GET",
         f"https://{unit_ip}:9200/_cluster/health",
+        session=session,
     )
 
 
@@ -477,7 +547,10 @@ async def cluster_health(
     stop=stop_after_attempt(15),
 )
 async def check_cluster_formation_successful(
-    ops_test: OpsTest, unit_ip: str, unit_names: List[str]
+    ops_test: OpsTest,
+    unit_ip: str,
+    unit_names: List[str],
+    session: Optional[requests.Session] = None,
 ) -> bool:
     """Returns whether the cluster formation was successful and all nodes successfully joined.
 
@@ -485,11 +558,14 @@ async def check_cluster_formation_successful(
         ops_test: The ops test framework instance.
         unit_ip: The ip of the unit of the OpenSearch unit.
         unit_names: The list of unit names in the cluster.
+        session: a session to reuse, a new one if not set.
 
     Returns:
         Whether The cluster formation is successful.
     """
-    response = await http_request(ops_test, "GET", f"https://{unit_ip}:9200/_nodes")
+    response = await http_request(
+        ops_test, "GET", f"https://{unit_ip}:9200/_nodes", session=session
+    )
     if "_nodes" not in response or "nodes" not in response:
         return False
 
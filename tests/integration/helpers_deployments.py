@@ -6,18 +6,27 @@ import logging
 import subprocess
 from datetime import datetime, timedelta
 from hashlib import md5
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from uuid import uuid4
 
 from dateutil.parser import parse
 from pytest_operator.plugin import OpsTest
-from tenacity import RetryError, Retrying, stop_after_delay, wait_fixed
+from tenacity import (
+    AsyncRetrying,
+    RetryError,
+    stop_after_delay,
+    wait_exponential,
+    wait_random,
+)
 
 logging.basicConfig(
     format="%(asctime)s - %(levelname)s - %(filename)s:%(lineno)s", datefmt="%H:%M:%S"
 )
 logger = logging.getLogger(__name__)
 
+# hostname of each (model uuid, machine id), juju never reuses a machine id within a model
+_machine_hostnames: Dict[Tuple[str, str], str] = {}
+
 
 class Status:
     """Model class for status."""
@@ -113,10 +122,24 @@ def _progress_line(units: List[Unit]) -> str:
     return log
 
 
-async def get_unit_hostname(ops_test: OpsTest, unit_id: int, app: str) -> str:
-    """Get the hostname of a specific unit."""
+async def get_unit_hostname(
+    ops_test: OpsTest, unit_id: int, app: str, machine_id: Optional[str] = None
+) -> str:
+    """Get the hostname of a specific unit.
+
+    If the machine of the unit is passed, its hostname is cached and juju ssh only runs once.
+    """
+    key = (ops_test.model.uuid, machine_id)
+    if machine_id is not None and (hostname := _machine_hostnames.get(key)):
+        return hostname
+
     _, hostname, _ = await ops_test.juju("ssh", f"{app}/{unit_id}", "hostname")
-    return hostname.strip()
+    hostname = hostname.strip()
+    # the unit may not be reachable yet, an empty hostname must not be cached
+    if machine_id is not None and hostname:
+        _machine_hostnames[key] = hostname
+
+    return hostname
 
 
 async def get_application_units(ops_test: OpsTest, app: str) -> List[Unit]:
@@ -140,7 +163,7 @@ async def get_application_units(ops_test: OpsTest, app: str) -> List[Unit]:
             short_name=u_name.replace("/", "-"),
             name=f"{u_name.replace('/', '-')}.{app_short_id}",
             ip=unit["public-address"],
-            hostname=await get_unit_hostname(ops_test, unit_id, app),
+            hostname=await get_unit_hostname(ops_test, unit_id, app, unit["machine"]),
             is_leader=unit.get("leader", False),
             machine_id=int(unit["machine"]),
             workload_status=Status(
@@ -194,7 +217,7 @@ async def get_application_subordinate_units(
             short_name=u_name.replace("/", "-"),
             name=f"{u_name.replace('/', '-')}.{app_short_id}",
             ip=unit["public-address"],
-            hostname=await get_unit_hostname(ops_test, unit_id, app),
+            hostname=await get_unit_hostname(ops_test, unit_id, app, principal_unit["machine"]),
             is_leader=unit.get("leader", False),
             machine_id=-1,
             workload_status=Status(
@@ -355,6 +378,10 @@ async def wait_until(  # noqa: C901
     wait_for_exact_units: Optional[Union[int, Dict[str, int]]] = -1,
     idle_period: int = 30,
     timeout: int = 1200,
+    initial_interval: float = 2,
+    max_interval: float = 15,
+    backoff_factor: float = 2,
+    jitter: float = 1,
 ) -> None:
     """Block and wait until a set of statuses and timeouts are met.
 
@@ -375,6 +402,11 @@ async def wait_until(  # noqa: C901
             only happens at the application level.
         idle_period: Seconds to wait for the agents of each application unit to be idle.
         timeout: Time to wait before giving up on waiting.
+        initial_interval: Seconds to wait before the first re-check of the conditions.
+        max_interval: Upper bound, in seconds, of the wait between two checks.
+        backoff_factor: Multiplier applied to the wait after every unsuccessful check.
+        jitter: Upper bound, in seconds, of the random delay added to every wait, so that
+            concurrent waits do not poll the controller in lockstep.
     """
     if not apps:
         raise ValueError("apps must be specified.")
@@ -396,7 +428,17 @@ async def wait_until(  # noqa: C901
                 f"juju status --model {ops_test.model.info.name}", shell=True
             ).decode("utf-8")
         )
-        for attempt in Retrying(stop=stop_after_delay(timeout), wait=wait_fixed(10)):
+        # sleep asynchronously between checks, to not block the event loop of concurrent waits
+        async for attempt in AsyncRetrying(
+            stop=stop_after_delay(timeout),
+            wait=wait_exponential(
+                multiplier=initial_interval,
+                min=initial_interval,
+                max=max_interval,
+                exp_base=backoff_factor,
+            )
+            + wait_random(0, jitter),
+        ):
             with attempt:
                 logger.info(f"\n\n\n{now()} -- Waiting for model...")
                 if await _is_every_condition_met(
@@ -64,16 +64,15 @@ async def test_build_and_deploy(
     await ops_test.model.integrate(MAIN_APP, TLS_CERTIFICATES_APP_NAME)
 
     await ops_test.model.wait_for_idle(apps=[MAIN_APP, TLS_CERTIFICATES_APP_NAME], timeout=TIMEOUT)
-    main_peer_cluster_orchestrator_offer = f"offer {ops_test.model.info.name}.{MAIN_APP}:{PeerClusterOrchestratorRelationName} {MAIN_ORCHESTRATOR_OFFER}"
     logger.info("Offering relations in main model...")
-    await ops_test.juju(*main_peer_cluster_orchestrator_offer.split())
-
-    certificates_offer = f"offer {ops_test.model.info.name}.{TLS_CERTIFICATES_APP_NAME}:{TLS_RELATION} {CERTS_OFFER}"
-    await ops_test.juju(*certificates_offer.split())
+    await ops_test.model.create_offer(
+        f"{MAIN_APP}:{PeerClusterOrchestratorRelationName}", MAIN_ORCHESTRATOR_OFFER
+    )
+    await ops_test.model.create_offer(f"{TLS_CERTIFICATES_APP_NAME}:{TLS_RELATION}", CERTS_OFFER)
 
     main_model_name = f"{ops_test.model.info.name}"
-    consume_main = f"consume admin/{main_model_name}.{MAIN_ORCHESTRATOR_OFFER}"
-    consume_certs = f"consume admin/{main_model_name}.{CERTS_OFFER}"
+    consume_main = f"admin/{main_model_name}.{MAIN_ORCHESTRATOR_OFFER}"
+    consume_certs = f"admin/{main_model_name}.{CERTS_OFFER}"
 
     with ops_test.model_context("failover"):
         await failover_model.deploy(
@@ -85,8 +84,8 @@ async def test_build_and_deploy(
         )
 
         logger.info("Consuming offers in failover model...")
-        await ops_test.juju(*consume_main.split())
-        await ops_test.juju(*consume_certs.split())
+        await failover_model.consume(consume_main)
+        await failover_model.consume(consume_certs)
         logger.info("Adding integrations in failover model...")
         await failover_model.integrate(
             f"{FAILOVER_APP}",
@@ -96,9 +95,10 @@ async def test_build_and_deploy(
         await failover_model.integrate(f"{FAILOVER_APP}", f"{CERTS_OFFER}:{TLS_RELATION}")
         await failover_model.wait_for_idle(apps=[FAILOVER_APP], timeout=TIMEOUT)
 
-        failover_peer_cluster_orchestrator_offer = f"offer {failover_model.info.name}.{FAILOVER_APP}:{PeerClusterOrchestratorRelationName} {FAILOVER_ORCHESTRATOR_OFFER}"
         logger.info("Offering relations from failover model...")
-        await ops_test.juju(*failover_peer_cluster_orchestrator_offer.split())
+        await failover_model.create_offer(
+            f"{FAILOVER_APP}:{PeerClusterOrchestratorRelationName}", FAILOVER_ORCHESTRATOR_OFFER
+        )
 
     with ops_test.model_context("data"):
         await data_model.deploy(
@@ -110,13 +110,11 @@ async def test_build_and_deploy(
             | CONFIG_OPTS,
         )
 
-        consume_failover = (
-            f"consume admin/{failover_model.info.name}.{FAILOVER_ORCHESTRATOR_OFFER}"
-        )
+        consume_failover = f"admin/{failover_model.info.name}.{FAILOVER_ORCHESTRATOR_OFFER}"
         logger.info("Consuming offers in data model...")
-        await ops_test.juju(*consume_main.split())
-        await ops_test.juju(*consume_failover.split())
-        await ops_test.juju(*consume_certs.split())
+        await data_model.consume(consume_main)
+        await data_model.consume(consume_failover)
+        await data_model.consume(consume_certs)
 
         logger.info("Integrating relations in data model...")
         await data_model.integrate(f"{DATA_APP}", f"{CERTS_OFFER}:{TLS_RELATION}")
@@ -3,11 +3,12 @@
 
 import json
 import logging
-from asyncio import gather
+from asyncio import gather, to_thread
+from typing import Any, Dict, Optional, Tuple
 
 import pytest
 import requests
-from integration.helpers import CONFIG_OPTS, get_leader_unit_ip
+from integration.helpers import CONFIG_OPTS, get_leader_unit_ip, http_request
 from juju.client.client import Action
 from juju.model import Model
 from pytest_operator.plugin import OpsTest
@@ -59,27 +60,35 @@ async def test_setup_relations(ops_test: OpsTest, microk8s_model: Model):
 
     Connects OpenSearch, data integrator and identity platform (cross-model).
     """
-    await microk8s_model.create_offer("certificates", "certificates", "self-signed-certificates")
-    await ops_test.model.consume(f"admin/{microk8s_model.name}.certificates")
-    await ops_test.model.integrate("wazuh-indexer:certificates", "certificates")
-
-    await microk8s_model.create_offer("oauth", "oauth", "hydra")
-    await ops_test.model.consume(f"admin/{microk8s_model.name}.oauth")
-    await ops_test.model.integrate("wazuh-indexer:oauth", "oauth")
-
-    await ops_test.model.integrate(
-        "wazuh-indexer:opensearch-client", f"{DATA_INTEGRATOR_NAME}:opensearch"
+    await gather(
+        microk8s_model.create_offer("certificates", "certificates", "self-signed-certificates"),
+        microk8s_model.create_offer("oauth", "oauth", "hydra"),
+    )
+    await gather(
+        ops_test.model.consume(f"admin/{microk8s_model.name}.certificates"),
+        ops_test.model.consume(f"admin/{microk8s_model.name}.oauth"),
+    )
+    await gather(
+        ops_test.model.integrate("wazuh-indexer:certificates", "certificates"),
+        ops_test.model.integrate("wazuh-indexer:oauth", "oauth"),
+        ops_test.model.integrate(
+            "wazuh-indexer:opensearch-client", f"{DATA_INTEGRATOR_NAME}:opensearch"
+        ),
     )
 
     await gather(ops_test.model.wait_for_idle(status="active"), microk8s_model.wait_for_idle())
 
 
-@pytest.mark.abort_on_fail
-async def test_setup_oauth(ops_test: OpsTest, microk8s_model: Model):
-    """Configure new OAuth client on Hydra (identity platform).
+async def get_data_integrator_user(ops_test: OpsTest, app: str) -> Optional[str]:
+    """Username of the OpenSearch user created for a data integrator application."""
+    action = await ops_test.model.applications[app].units[0].run_action("get-credentials")
+    await action.wait()
+    return action.results.get("opensearch", {}).get("username")
 
-    Also, acquire corresponding access token for the further testing.
-    """
+
+@pytest.fixture(scope="module")
+async def oauth_client(microk8s_model: Model) -> Tuple[str, str]:
+    """Configure new OAuth client on Hydra (identity platform), return its id and secret."""
     action: Action = (
         await microk8s_model.applications["hydra"]
         .units[0]
@@ -93,13 +102,14 @@ async def test_setup_oauth(ops_test: OpsTest, microk8s_model: Model):
         )
     )
     await action.wait()
-    global oauth_client_id
-    oauth_client_id = action.results.get("client-id")
-    oauth_client_secret = action.results.get("client-secret")
-    assert (
-        oauth_client_id and oauth_client_secret
-    ), "failed to retrieve oauth client id and secret from hydra"
+    client_id, client_secret = action.results.get("client-id"), action.results.get("client-secret")
+    assert client_id and client_secret, "failed to retrieve oauth client id and secret from hydra"
+    return client_id, client_secret
+
 
+@pytest.fixture(scope="module")
+async def hydra_url(microk8s_model: Model) -> str:
+    """URL of Hydra, as proxied by traefik."""
     action = (
         await microk8s_model.applications["traefik-public"]
         .units[0]
@@ -107,55 +117,99 @@ async def test_setup_oauth(ops_test: OpsTest, microk8s_model: Model):
     )
     await action.wait()
     result = json.loads(action.results.get("proxied-endpoints", "{}"))
-    hydra_url = result.get("hydra", {}).get("url")
-    assert hydra_url, "failed to retrieve hydra url from traefik"
-
-    result = requests.post(
+    url = result.get("hydra", {}).get("url")
+    assert url, "failed to retrieve hydra url from traefik"
+    return url
+
+
+@pytest.fixture(scope="module")
+async def oauth_access_token(
+    oauth_client: Tuple[str, str], hydra_url: str, http_session: requests.Session
+) -> str:
+    """Access token of the OAuth client, acquired from Hydra."""
+    result = await to_thread(
+        http_session.post,
         f"{hydra_url}/oauth2/token",
         {"scope": "openid", "grant_type": "client_credentials", "audience": "opensearch"},
-        auth=requests.auth.HTTPBasicAuth(oauth_client_id, oauth_client_secret),
+        auth=requests.auth.HTTPBasicAuth(*oauth_client),
         verify=False,
     )
-    global oauth_access_token
-    oauth_access_token = result.json().get("access_token")
-    assert oauth_access_token, "failed to retrieve access token from hydra"
+    assert result.ok, f"failed to retrieve access token from hydra: {result.text}"
+    access_token = result.json().get("access_token")
+    assert access_token, "failed to retrieve access token from hydra"
+    return access_token
+
+
+@pytest.fixture(scope="module")
+def oauth_headers(oauth_access_token: str) -> Dict[str, str]:
+    """Headers authenticating requests to OpenSearch with the OAuth access token."""
+    return {"Authorization": f"Bearer {oauth_access_token}"}
+
+
+@pytest.fixture(scope="module")
+async def original_opensearch_config(ops_test: OpsTest) -> Dict[str, Any]:
+    """Configuration of OpenSearch before any roles mapping is set by the tests."""
+    return await ops_test.model.applications["wazuh-indexer"].get_config()
+
+
+@pytest.fixture(scope="module")
+async def opensearch_address(ops_test: OpsTest) -> str:
+    """IP of the OpenSearch leader unit."""
+    return await get_leader_unit_ip(ops_test, "wazuh-indexer")
 
 
 @pytest.mark.abort_on_fail
-async def test_oauth_access(ops_test: OpsTest, microk8s_model: Model):
+async def test_setup_oauth(oauth_client: Tuple[str, str], hydra_url: str, oauth_access_token: str):
+    """Configure new OAuth client on Hydra (identity platform).
+
+    Also, acquire corresponding access token for the further testing. The fixtures check what
+    they retrieve themselves, so that a failure is reported whichever test sets them up first.
+    """
+
+
+@pytest.mark.abort_on_fail
+async def test_oauth_access(
+    ops_test: OpsTest,
+    http_session: requests.Session,
+    oauth_client: Tuple[str, str],
+    oauth_headers: Dict[str, str],
+    original_opensearch_config: Dict[str, Any],
+    opensearch_address: str,
+):
     """Check access to the OpenSearch with an access token, acquired earlier.
 
     Ensure that roles mapping works correctly by elevating user
     to the admin role and checking access to the admin endpoint.
     """
-    global opensearch_address
-    opensearch_address = await get_leader_unit_ip(ops_test, "wazuh-indexer")
     opensearch_url = f"https://{opensearch_address}:9200/_cat/indices"
-    result = requests.get(
-        opensearch_url, headers={"Authorization": f"Bearer {oauth_access_token}"}, verify=False
-    )
-    assert result.json().get("status") == 403, "no permissions error expected"
-
-    action = (
-        await ops_test.model.applications[DATA_INTEGRATOR_NAME]
-        .units[0]
-        .run_action("get-credentials")
+    result, data_integrator_user = await gather(
+        http_request(
+            ops_test,
+            "GET",
+            opensearch_url,
+            headers=oauth_headers,
+            session=http_session,
+        ),
+        get_data_integrator_user(ops_test, DATA_INTEGRATOR_NAME),
     )
-    await action.wait()
-    data_integrator_user = action.results.get("opensearch", {}).get("username")
+    assert result.get("status") == 403, "no permissions error expected"
     assert data_integrator_user, "failed to retrieve data integrator user"
 
-    global original_opensearch_config
-    original_opensearch_config = await ops_test.model.applications["wazuh-indexer"].get_config()
+    oauth_client_id, _ = oauth_client
     config_with_roles = original_opensearch_config.copy()
     config_with_roles["roles_mapping"] = json.dumps({oauth_client_id: data_integrator_user})
     await ops_test.model.applications["wazuh-indexer"].set_config(config_with_roles)
     await ops_test.model.wait_for_idle(status="active")
 
-    result = requests.get(
-        opensearch_url, headers={"Authorization": f"Bearer {oauth_access_token}"}, verify=False
+    status_code = await http_request(
+        ops_test,
+        "GET",
+        opensearch_url,
+        resp_status_code=True,
+        headers=oauth_headers,
+        session=http_session,
     )
-    assert result.status_code == 200, "request expected to succeed with roles mapping"
+    assert status_code == 200, "request expected to succeed with roles mapping"
 
 
 @pytest.mark.abort_on_fail
@@ -166,67 +220,86 @@ async def test_deploy_second_client(ops_test: OpsTest, microk8s_model: Model):
         application_name=SECOND_DATA_INTEGRATOR_NAME,
         config=SECOND_DATA_INTEGRATOR_CONFIG,
     )
-    await ops_test.model.wait_for_idle()
+    # juju queues the integration until the new application is ready
     await ops_test.model.integrate(SECOND_DATA_INTEGRATOR_NAME, "wazuh-indexer")
-    await ops_test.model.wait_for_idle()
+    await ops_test.model.wait_for_idle(
+        apps=[SECOND_DATA_INTEGRATOR_NAME, "wazuh-indexer"], status="active"
+    )
 
 
 @pytest.mark.abort_on_fail
-async def test_oauth_access_second_client(ops_test: OpsTest, microk8s_model: Model):
+async def test_oauth_access_second_client(
+    ops_test: OpsTest,
+    http_session: requests.Session,
+    oauth_client: Tuple[str, str],
+    oauth_headers: Dict[str, str],
+    original_opensearch_config: Dict[str, Any],
+    opensearch_address: str,
+):
     """Change roles mapping from first data integrator user to second one.
 
     Ensure, that admin permissions from the first one is removed, while role
     from the second one is added.
     """
-    action = (
-        await ops_test.model.applications[SECOND_DATA_INTEGRATOR_NAME]
-        .units[0]
-        .run_action("get-credentials")
+    second_data_integrator_user = await get_data_integrator_user(
+        ops_test, SECOND_DATA_INTEGRATOR_NAME
     )
-    await action.wait()
-    second_data_integrator_user = action.results.get("opensearch", {}).get("username")
     assert second_data_integrator_user, "failed to retrieve second data integrator user"
 
+    oauth_client_id, _ = oauth_client
     config_with_roles = original_opensearch_config.copy()
     config_with_roles["roles_mapping"] = json.dumps({oauth_client_id: second_data_integrator_user})
     await ops_test.model.applications["wazuh-indexer"].set_config(config_with_roles)
     await ops_test.model.wait_for_idle(status="active")
 
-    # Ensure first data integrator admin role is removed
-    result = requests.get(
-        f"https://{opensearch_address}:9200/_cat/indices",
-        headers={"Authorization": f"Bearer {oauth_access_token}"},
-        verify=False,
+    # Ensure first data integrator admin role is removed, and second one is configured
+    indices_result, authinfo_result = await gather(
+        http_request(
+            ops_test,
+            "GET",
+            f"https://{opensearch_address}:9200/_cat/indices",
+            headers=oauth_headers,
+            session=http_session,
+        ),
+        http_request(
+            ops_test,
+            "GET",
+            f"https://{opensearch_address}:9200/_plugins/_security/authinfo",
+            headers=oauth_headers,
+            session=http_session,
+            json_resp=False,
+        ),
     )
     assert (
-        result.json().get("status") == 403
+        indices_result.get("status") == 403
     ), "no permissions error expected as admin role should be removed"
-
-    # Ensure second data integrator role is configured
-    result = requests.get(
-        f"https://{opensearch_address}:9200/_plugins/_security/authinfo",
-        headers={"Authorization": f"Bearer {oauth_access_token}"},
-        verify=False,
-    )
-    assert result.status_code == 200, "request for authinfo should success"
-    assert sorted(result.json().get("roles")) == sorted(
-        [
-            "own_index",
-            second_data_integrator_user,
-        ]
+    assert authinfo_result.status_code == 200, "request for authinfo should success"
+    roles = authinfo_result.json().get("roles")
+    roles.sort()
+    assert roles == sorted(
+        ["own_index", second_data_integrator_user]
     ), "second data integrator role should be enabled"
 
 
 @pytest.mark.abort_on_fail
-async def test_oauth_access_cleanup(ops_test: OpsTest, microk8s_model: Model):
+async def test_oauth_access_cleanup(
+    ops_test: OpsTest,
+    http_session: requests.Session,
+    oauth_headers: Dict[str, str],
+    original_opensearch_config: Dict[str, Any],
+    opensearch_address: str,
+):
     """Ensure that all of the oauth clients permissions are removed with clean roles mapping."""
     await ops_test.model.applications["wazuh-indexer"].set_config(original_opensearch_config)
     await ops_test.model.wait_for_idle(status="active")
 
-    result = requests.get(
+    result = await http_request(
+        ops_test,
+        "GET",
         f"https://{opensearch_address}:9200/_plugins/_security/authinfo",
-        headers={"Authorization": f"Bearer {oauth_access_token}"},
-        verify=False,
+        headers=oauth_headers,
+        session=http_session,
+        json_resp=False,
     )
     assert result.status_code == 200, "request for authinfo should success"
     assert result.json().get("roles") == ["own_index"], "all the mapped roles should be removed"
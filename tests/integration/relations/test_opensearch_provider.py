@@ -5,7 +5,6 @@ import asyncio
 import json
 import logging
 import re
-import time
 
 import pytest
 from charms.opensearch.v0.constants_charm import ClientRelationName
@@ -332,7 +331,7 @@ async def test_scaling(ops_test: OpsTest):
         idle_period=50,  # slightly less than update-status-interval period
     )
     # Now, we want to sleep until an update-status happens
-    time.sleep(30)
+    await asyncio.sleep(30)
     assert await _is_number_of_endpoints_valid(
         CLIENT_APP_NAME, FIRST_RELATION_NAME
     ), await rel_endpoints(CLIENT_APP_NAME, FIRST_RELATION_NAME)
@@ -350,7 +349,7 @@ async def test_multiple_relations(ops_test: OpsTest, application_charm):
     )
 
     # sleep a minute to ease the load on machine
-    time.sleep(60)
+    await asyncio.sleep(60)
 
     # Deploy secondary application.
     logger.info(f"Deploying 1 unit of {SECONDARY_CLIENT_APP_NAME}")
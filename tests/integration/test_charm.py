@@ -4,11 +4,12 @@
 
 import asyncio
 import logging
-import shlex
+import re
 import subprocess
+from typing import Any, Dict, Tuple
 
 import pytest
-import yaml
+import requests
 from charms.opensearch.v0.constants_charm import (
     OPENSEARCH_SNAP_REVISION,
     OpenSearchSystemUsers,
@@ -25,6 +26,7 @@ from .helpers import (
     APP_NAME,
     CONFIG_OPTS,
     MODEL_CONFIG,
+    forget_admin_secrets,
     get_application_unit_ids,
     get_conf_as_dict,
     get_leader_unit_id,
@@ -40,6 +42,29 @@ logger = logging.getLogger(__name__)
 
 
 DEFAULT_NUM_UNITS = 2
+# e.g. "installed:  2.19.1  (71)  1GB held" -> version, revision, notes
+INSTALLED_SNAP_RE = re.compile(r"^installed:\s+(\S+)\s+\((\S+)\)\s+\S+\s+(\S+)", re.M)
+INTERNAL_USERS_FILE = (
+    "/var/snap/wazuh-indexer/current/etc/wazuh-indexer/opensearch-security/internal_users.yml"
+)
+
+
+@pytest.fixture(scope="module")
+async def leader(ops_test: OpsTest) -> Tuple[int, str]:
+    """ID and IP of the leader unit, the leader does not change once the cluster is deployed."""
+    return await asyncio.gather(get_leader_unit_id(ops_test), get_leader_unit_ip(ops_test))
+
+
+@pytest.fixture(scope="module")
+def leader_id(leader: Tuple[int, str]) -> int:
+    """ID of the leader unit."""
+    return leader[0]
+
+
+@pytest.fixture(scope="module")
+def leader_ip(leader: Tuple[int, str]) -> str:
+    """IP of the leader unit."""
+    return leader[1]
 
 
 @pytest.mark.abort_on_fail
@@ -47,16 +72,18 @@ async def test_deploy_and_remove_single_unit(charm, series, ops_test: OpsTest) -
     """Build and deploy OpenSearch with a single unit and remove it."""
     await ops_test.model.set_config(MODEL_CONFIG)
 
-    await ops_test.model.deploy(
-        charm,
-        num_units=1,
-        series=series,
-        config=CONFIG_OPTS,
-    )
-    # Deploy TLS Certificates operator.
+    # Deploy OpenSearch and the TLS Certificates operator.
     config = {"ca-common-name": "CN_CA"}
-    await ops_test.model.deploy(
-        TLS_CERTIFICATES_APP_NAME, channel=TLS_STABLE_CHANNEL, config=config
+    await asyncio.gather(
+        ops_test.model.deploy(
+            charm,
+            num_units=1,
+            series=series,
+            config=CONFIG_OPTS,
+        ),
+        ops_test.model.deploy(
+            TLS_CERTIFICATES_APP_NAME, channel=TLS_STABLE_CHANNEL, config=config
+        ),
     )
     # Relate it to OpenSearch to set up TLS.
     await ops_test.model.integrate(APP_NAME, TLS_CERTIFICATES_APP_NAME)
@@ -78,8 +105,9 @@ async def test_deploy_and_remove_single_unit(charm, series, ops_test: OpsTest) -
     finally:
         # Now, clean up
         await c_writes.stop()
+        # the TLS operator is kept, the next deployment relates to it again
         await ops_test.model.remove_application(APP_NAME, block_until_done=True)
-        await ops_test.model.remove_application(TLS_CERTIFICATES_APP_NAME, block_until_done=True)
+        forget_admin_secrets(ops_test, app=APP_NAME)
 
 
 @pytest.mark.abort_on_fail
@@ -90,12 +118,24 @@ async def test_build_and_deploy(charm, series, ops_test: OpsTest) -> None:
 
     await ops_test.model.set_config(MODEL_CONFIG)
 
-    await ops_test.model.deploy(
-        charm,
-        num_units=DEFAULT_NUM_UNITS,
-        series=series,
-        config=CONFIG_OPTS,
-    )
+    deployments = [
+        ops_test.model.deploy(
+            charm,
+            num_units=DEFAULT_NUM_UNITS,
+            series=series,
+            config=CONFIG_OPTS,
+        )
+    ]
+    if TLS_CERTIFICATES_APP_NAME not in ops_test.model.applications:
+        # not related yet, the admin secrets are only checked to be unavailable without TLS
+        deployments.append(
+            ops_test.model.deploy(
+                TLS_CERTIFICATES_APP_NAME,
+                channel=TLS_STABLE_CHANNEL,
+                config={"ca-common-name": "CN_CA"},
+            )
+        )
+    await asyncio.gather(*deployments)
     await wait_until(
         ops_test,
         apps=[APP_NAME],
@@ -106,20 +146,16 @@ async def test_build_and_deploy(charm, series, ops_test: OpsTest) -> None:
 
 
 @pytest.mark.abort_on_fail
-async def test_actions_get_admin_password(ops_test: OpsTest) -> None:
+async def test_actions_get_admin_password(
+    ops_test: OpsTest, leader_id: int, leader_ip: str, http_session: requests.Session
+) -> None:
     """Test the retrieval of admin secrets."""
-    leader_id = await get_leader_unit_id(ops_test)
 
     # 1. run the action prior to finishing the config of TLS
     result = await run_action(ops_test, leader_id, "get-password")
     assert result.status == "failed"
 
-    # Deploy TLS Certificates operator.
-    config = {"ca-common-name": "CN_CA"}
-    await ops_test.model.deploy(
-        TLS_CERTIFICATES_APP_NAME, channel=TLS_STABLE_CHANNEL, config=config
-    )
-    # Relate it to OpenSearch to set up TLS.
+    # Relate the TLS Certificates operator, deployed along OpenSearch, to set up TLS.
     await ops_test.model.integrate(APP_NAME, TLS_CERTIFICATES_APP_NAME)
     await wait_until(
         ops_test,
@@ -129,7 +165,6 @@ async def test_actions_get_admin_password(ops_test: OpsTest) -> None:
         wait_for_exact_units=DEFAULT_NUM_UNITS,
     )
 
-    leader_ip = await get_leader_unit_ip(ops_test)
     test_url = f"https://{leader_ip}:9200/"
 
     # 2. run the action after finishing the config of TLS
@@ -139,7 +174,9 @@ async def test_actions_get_admin_password(ops_test: OpsTest) -> None:
     assert result.get("ca-chain")
 
     # parse_output fields non-null + make http request success
-    http_resp_code = await http_request(ops_test, "GET", test_url, resp_status_code=True)
+    http_resp_code = await http_request(
+        ops_test, "GET", test_url, resp_status_code=True, session=http_session
+    )
     assert http_resp_code == 200
 
     # 3. test retrieving password from non-supported user
@@ -148,12 +185,12 @@ async def test_actions_get_admin_password(ops_test: OpsTest) -> None:
 
 
 @pytest.mark.abort_on_fail
-async def test_actions_rotate_admin_password(ops_test: OpsTest) -> None:
+async def test_actions_rotate_admin_password(
+    ops_test: OpsTest, leader_id: int, leader_ip: str, http_session: requests.Session
+) -> None:
     """Test the rotation and change of admin password."""
-    leader_ip = await get_leader_unit_ip(ops_test)
     test_url = f"https://{leader_ip}:9200/"
 
-    leader_id = await get_leader_unit_id(ops_test)
     non_leader_id = [
         unit_id for unit_id in get_application_unit_ids(ops_test) if unit_id != leader_id
     ][0]
@@ -173,11 +210,18 @@ async def test_actions_rotate_admin_password(ops_test: OpsTest) -> None:
     assert password1
     assert password1 == (await get_secrets(ops_test, leader_id))["password"]
 
-    http_resp_code = await http_request(ops_test, "GET", test_url, resp_status_code=True)
+    http_resp_code = await http_request(
+        ops_test, "GET", test_url, resp_status_code=True, session=http_session
+    )
     assert http_resp_code == 200
 
     http_resp_code = await http_request(
-        ops_test, "GET", test_url, resp_status_code=True, user_password=password0
+        ops_test,
+        "GET",
+        test_url,
+        resp_status_code=True,
+        user_password=password0,
+        session=http_session,
     )
     assert http_resp_code == 401
 
@@ -186,27 +230,35 @@ async def test_actions_rotate_admin_password(ops_test: OpsTest) -> None:
     password2 = result.response.get("admin-password")
     assert password2
 
-    http_resp_code = await http_request(ops_test, "GET", test_url, resp_status_code=True)
+    http_resp_code = await http_request(
+        ops_test, "GET", test_url, resp_status_code=True, session=http_session
+    )
     assert http_resp_code == 200
 
     http_resp_code = await http_request(
-        ops_test, "GET", test_url, resp_status_code=True, user_password=password1
+        ops_test,
+        "GET",
+        test_url,
+        resp_status_code=True,
+        user_password=password1,
+        session=http_session,
     )
     assert http_resp_code == 401
 
 
-@pytest.mark.abort_on_fail
-@pytest.mark.parametrize("user", [("monitor"), ("kibanaserver")])
-async def test_actions_rotate_system_user_password(ops_test: OpsTest, user) -> None:
-    """Test the rotation and change of admin password."""
-    leader_ip = await get_leader_unit_ip(ops_test)
-    test_url = f"https://{leader_ip}:9200/"
-
-    leader_id = await get_leader_unit_id(ops_test)
-
+async def _rotate_system_user_password(
+    ops_test: OpsTest,
+    leader_id: int,
+    test_url: str,
+    user: str,
+    action_lock: asyncio.Lock,
+    http_session: requests.Session,
+) -> None:
+    """Rotate the password of a system user and check only the new one is accepted."""
     # run the action w/o password parameter
     password0 = (await get_secrets(ops_test, leader_id, user))["password"]
-    result = await run_action(ops_test, leader_id, "set-password", {"username": user})
+    async with action_lock:
+        result = await run_action(ops_test, leader_id, "set-password", {"username": user})
     password1 = result.response.get(f"{user}-password")
     assert password1 != password0
 
@@ -218,6 +270,7 @@ async def test_actions_rotate_system_user_password(ops_test: OpsTest, user) -> N
         resp_status_code=True,
         user=user,
         user_password=password1,
+        session=http_session,
     )
     assert http_resp_code == 200
 
@@ -228,14 +281,16 @@ async def test_actions_rotate_system_user_password(ops_test: OpsTest, user) -> N
         resp_status_code=True,
         user=user,
         user_password=password0,
+        session=http_session,
     )
     assert http_resp_code == 401
 
     # 2. change password and verify the new password works and old password not
     password0 = (await get_secrets(ops_test, leader_id, user))["password"]
-    result = await run_action(
-        ops_test, leader_id, "set-password", {"username": user, "password": "new_pwd"}
-    )
+    async with action_lock:
+        result = await run_action(
+            ops_test, leader_id, "set-password", {"username": user, "password": "new_pwd"}
+        )
     password1 = result.response.get(f"{user}-password")
     assert password1
     assert password1 == (await get_secrets(ops_test, leader_id, user))["password"]
@@ -247,6 +302,7 @@ async def test_actions_rotate_system_user_password(ops_test: OpsTest, user) -> N
         resp_status_code=True,
         user=user,
         user_password=password1,
+        session=http_session,
     )
     assert http_resp_code == 200
 
@@ -257,109 +313,120 @@ async def test_actions_rotate_system_user_password(ops_test: OpsTest, user) -> N
         resp_status_code=True,
         user=user,
         user_password=password0,
+        session=http_session,
     )
     assert http_resp_code == 401
 
 
 @pytest.mark.abort_on_fail
-async def test_check_pinned_revision(ops_test: OpsTest) -> None:
-    """Test check the pinned revision."""
-    leader_id = await get_leader_unit_id(ops_test)
-
-    installed_info = yaml.safe_load(
-        subprocess.check_output(
-            [
-                "juju",
-                "ssh",
-                f"wazuh-indexer/{leader_id}",
-                "--",
-                "sudo",
-                "snap",
-                "info",
-                "wazuh-indexer",
-                "--color=never",
-                "--unicode=always",
-            ],
-            text=True,
-        ).replace("\r\n", "\n")
-    )["installed"].split()
+async def test_actions_rotate_system_user_password(
+    ops_test: OpsTest, leader_id: int, leader_ip: str, http_session: requests.Session
+) -> None:
+    """Test the rotation and change of the system users passwords."""
+    test_url = f"https://{leader_ip}:9200/"
+
+    # the users are independent, only their set-password actions are kept from interleaving
+    action_lock = asyncio.Lock()
+    await asyncio.gather(
+        *[
+            _rotate_system_user_password(
+                ops_test, leader_id, test_url, user, action_lock, http_session
+            )
+            for user in ["monitor", "kibanaserver"]
+        ]
+    )
+
+
+@pytest.fixture(scope="module")
+def installed_snap_info(ops_test: OpsTest, leader_id: int) -> Tuple[str, str, str]:
+    """Version, revision and notes of the leader's installed snap, fetched once for the module."""
+    snap_info = subprocess.run(
+        [
+            "juju",
+            "ssh",
+            "-m",
+            ops_test.model.info.name,
+            f"wazuh-indexer/{leader_id}",
+            "--",
+            "sudo",
+            "snap",
+            "info",
+            "wazuh-indexer",
+            "--color=never",
+            "--unicode=always",
+        ],
+        check=True,
+        text=True,
+        stdout=subprocess.PIPE,
+    ).stdout
+    installed_info = INSTALLED_SNAP_RE.search(snap_info).groups()
     logger.info(f"Installed snap: {installed_info}")
-    assert installed_info[1] == f"({OPENSEARCH_SNAP_REVISION})"
-    assert installed_info[3] == "held"
+    return installed_info
 
 
 @pytest.mark.abort_on_fail
-async def test_check_workload_version(ops_test: OpsTest) -> None:
-    """Test to check if the workload_version file is updated."""
-    leader_id = await get_leader_unit_id(ops_test)
-
-    installed_info = yaml.safe_load(
-        subprocess.check_output(
-            [
-                "juju",
-                "ssh",
-                "-m",
-                ops_test.model.info.name,
-                f"wazuh-indexer/{leader_id}",
-                "--",
-                "sudo",
-                "snap",
-                "info",
-                "wazuh-indexer",
-                "--color=never",
-                "--unicode=always",
-            ],
-            text=True,
-        ).replace("\r\n", "\n")
-    )["installed"].split()
-    logger.info(f"Installed snap: {installed_info}")
+async def test_check_pinned_revision(installed_snap_info: Tuple[str, str, str]) -> None:
+    """Test check the pinned revision."""
+    _, revision, notes = installed_snap_info
+    assert revision == str(OPENSEARCH_SNAP_REVISION)
+    assert notes == "held"
 
+
+@pytest.mark.abort_on_fail
+async def test_check_workload_version(installed_snap_info: Tuple[str, str, str]) -> None:
+    """Test to check if the workload_version file is updated."""
     workload_version = None
     with open("./workload_version") as f:
         workload_version = f.read().rstrip("\n")
-    assert installed_info[0] == workload_version
+    version, _, _ = installed_snap_info
+    assert version == workload_version
+
+
+@pytest.fixture(scope="module")
+async def internal_users_confs(ops_test: OpsTest) -> Dict[str, Dict[str, Any]]:
+    """The internal_users.yml of each unit, read concurrently and shared by the tests."""
+    unit_names = [unit.name for unit in ops_test.model.applications[APP_NAME].units]
+    confs = await asyncio.gather(
+        *[
+            asyncio.to_thread(get_conf_as_dict, ops_test, unit_name, INTERNAL_USERS_FILE)
+            for unit_name in unit_names
+        ]
+    )
+    return dict(zip(unit_names, confs))
 
 
 @pytest.mark.abort_on_fail
-async def test_all_units_have_all_local_users(ops_test: OpsTest) -> None:
+async def test_all_units_have_all_local_users(
+    leader_id: int, internal_users_confs: Dict[str, Dict[str, Any]]
+) -> None:
     """Compare the internal_users.yaml of all units."""
     # Get the leader's version of internal_users.yml
-    leader_id = await get_leader_unit_id(ops_test)
-    leader_name = f"{APP_NAME}/{leader_id}"
-    filename = (
-        "/var/snap/wazuh-indexer/current/etc/wazuh-indexer/opensearch-security/internal_users.yml"
-    )
-    leader_conf = get_conf_as_dict(ops_test, leader_name, filename)
+    leader_conf = internal_users_confs[f"{APP_NAME}/{leader_id}"]
 
     # Check on all units if they have the same
-    for unit in ops_test.model.applications[APP_NAME].units:
-        unit_conf = get_conf_as_dict(ops_test, unit.name, filename)
+    for unit_conf in internal_users_confs.values():
         for user in OpenSearchSystemUsers:
             assert leader_conf[user]["hash"] == unit_conf[user]["hash"]
 
 
 @pytest.mark.abort_on_fail
-async def test_all_units_have_internal_users_synced(ops_test: OpsTest) -> None:
+async def test_all_units_have_internal_users_synced(
+    leader_id: int, internal_users_confs: Dict[str, Dict[str, Any]]
+) -> None:
     """Compare the internal_users.yaml of all units."""
     # Get the leader's version of internal_users.yml
-    leader_id = await get_leader_unit_id(ops_test)
-    leader_name = f"{APP_NAME}/{leader_id}"
-    filename = (
-        "/var/snap/wazuh-indexer/current/etc/wazuh-indexer/opensearch-security/internal_users.yml"
-    )
-    leader_conf = get_conf_as_dict(ops_test, leader_name, filename)
+    leader_conf = internal_users_confs[f"{APP_NAME}/{leader_id}"]
 
     # Check on all units if they have the same
-    for unit in ops_test.model.applications[APP_NAME].units:
-        unit_conf = get_conf_as_dict(ops_test, unit.name, filename)
+    for unit_conf in internal_users_confs.values():
         assert leader_conf == unit_conf
 
 
 @pytest.mark.abort_on_fail
-async def test_add_users_and_calling_update_status(ops_test: OpsTest) -> None:
+async def test_add_users_and_calling_update_status(
+    ops_test: OpsTest, leader_id: int, leader_ip: str, http_session: requests.Session
+) -> None:
     """Add users and call update status."""
-    leader_id = await get_leader_unit_id(ops_test)
-    leader_ip = await get_leader_unit_ip(ops_test)
     test_url = f"https://{leader_ip}:9200/_plugins/_security/api/internalusers/my_user"
 
     http_resp_code = await http_request(
@@ -368,22 +435,40 @@ async def test_add_users_and_calling_update_status(ops_test: OpsTest) -> None:
         test_url,
         resp_status_code=True,
         payload={"hash": "1234"},
+        session=http_session,
     )
     assert http_resp_code >= 200 and http_resp_code < 300
 
-    cmd = '"export JUJU_DISPATCH_PATH=hooks/update-status; ./dispatch"'
-    exec_cmd = f"juju exec -u wazuh-indexer/{leader_id} -m {ops_test.model.name} -- {cmd}"
+    exec_cmd = [
+        "juju",
+        "exec",
+        "-u",
+        f"wazuh-indexer/{leader_id}",
+        "-m",
+        ops_test.model.name,
+        "--",
+        # passed as a single argument, so the remote shell runs both statements
+        "export JUJU_DISPATCH_PATH=hooks/update-status; ./dispatch",
+    ]
     try:
-        # The "normal" subprocess.run with "export ...; ..." cmd was failing
-        # Noticed that, for this case, canonical/jhack uses shlex instead to split.
-        # Adding it fixed the issue.
-        subprocess.run(shlex.split(exec_cmd))
-    except Exception as e:
+        subprocess.run(exec_cmd, check=True, text=True, capture_output=True)
+    except subprocess.CalledProcessError as e:
         logger.error(
             f"Failed to apply state: process exited with {e.returncode}; "
             f"stdout = {e.stdout}; "
             f"stderr = {e.stderr}.",
         )
-    await asyncio.sleep(300)
-    http_resp_code = await http_request(ops_test, "GET", test_url, resp_status_code=True)
+    # wait for the hook (and anything it triggered) to settle rather than a fixed 5 minutes;
+    # polling the endpoint alone would succeed before the hook had any chance to remove the user
+    await wait_until(
+        ops_test,
+        apps=[APP_NAME],
+        apps_statuses=["active"],
+        units_statuses=["active"],
+        wait_for_exact_units=DEFAULT_NUM_UNITS,
+        timeout=300,
+    )
+    http_resp_code = await http_request(
+        ops_test, "GET", test_url, resp_status_code=True, session=http_session
+    )
     assert http_resp_code >= 200 and http_resp_code < 300
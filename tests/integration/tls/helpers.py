@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 # Copyright 2024 Canonical Ltd.
 # See LICENSE file for licensing details.
-from typing import Dict
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
 
 import requests
 from pytest_operator.plugin import OpsTest
@@ -9,17 +12,22 @@ from tenacity import retry, stop_after_attempt, wait_fixed, wait_random
 
 from ..helpers import get_secret_by_label, http_request
 
+logger = logging.getLogger(__name__)
+
 
 @retry(
     wait=wait_fixed(wait=5) + wait_random(0, 5),
     stop=stop_after_attempt(15),
 )
-async def check_security_index_initialised(ops_test: OpsTest, unit_ip: str) -> bool:
+async def check_security_index_initialised(
+    ops_test: OpsTest, unit_ip: str, session: Optional[requests.Session] = None
+) -> bool:
     """Returns whether the security index is initialised.
 
     Args:
         ops_test: The ops test framework instance.
         unit_ip: The ip of the unit of the OpenSearch unit.
+        session: a session to reuse, a new one if not set.
 
     Returns:
         Whether The security index is initialised.
@@ -29,6 +37,7 @@ async def check_security_index_initialised(ops_test: OpsTest, unit_ip: str) -> b
         "HEAD",
         f"https://{unit_ip}:9200/.opendistro_security",
         resp_status_code=True,
+        session=session,
     )
     return response == 200
 
@@ -37,43 +46,125 @@ async def check_security_index_initialised(ops_test: OpsTest, unit_ip: str) -> b
     wait=wait_fixed(wait=5) + wait_random(0, 5),
     stop=stop_after_attempt(15),
 )
-async def check_unit_tls_configured(ops_test: OpsTest, unit_ip: str, unit_name: str) -> bool:
+async def check_unit_tls_configured(
+    ops_test: OpsTest,
+    unit_ip: str,
+    unit_name: str,
+    session: Optional[requests.Session] = None,
+) -> bool:
     """Returns whether TLS is enabled on the specific OpenSearch unit.
 
     Args:
         ops_test: The ops test framework instance.
         unit_ip: The ip of the unit of the OpenSearch unit.
         unit_name: The name of the OpenSearch unit.
+        session: a session to reuse, a new one if not set.
 
     Returns:
         Whether the node is up: no TLS config issues and TLS on HTTP layer successful.
     """
-    response = await http_request(ops_test, "GET", f"https://{unit_ip}:9200")
+    response = await http_request(ops_test, "GET", f"https://{unit_ip}:9200", session=session)
     return response["name"] == unit_name
 
 
+async def _fetch_loaded_tls_certificates(
+    ops_test: OpsTest, unit_ip: str, session: Optional[requests.Session] = None
+) -> Dict:
+    """Fetch the currently loaded TLS certificates once, without retrying."""
+    url = f"https://{unit_ip}:9200/_plugins/_security/api/ssl/certs"
+    admin_secret = await get_secret_by_label(ops_test, "wazuh-indexer:app:app-admin")
+
+    with open("admin.cert", "w") as cert:
+        cert.write(admin_secret["cert"])
+
+    with open("admin.key", "w") as key:
+        key.write(admin_secret["key"])
+
+    response = await asyncio.to_thread(
+        (session or requests).get, url, cert=("admin.cert", "admin.key"), verify=False
+    )
+    return response.json()
+
+
 @retry(
     wait=wait_fixed(wait=5) + wait_random(0, 5),
     stop=stop_after_attempt(15),
 )
-async def get_loaded_tls_certificates(ops_test: OpsTest, unit_ip: str) -> Dict:
+async def get_loaded_tls_certificates(
+    ops_test: OpsTest, unit_ip: str, session: Optional[requests.Session] = None
+) -> Dict:
     """Returns a dict with the currently loaded TLS certificates for http and transport layer.
 
     Args:
         ops_test: The ops test framework instance.
         unit_ip: The ip of the unit of the OpenSearch unit.
+        session: a session to reuse, a new one if not set.
 
     Returns:
         A dict with the currently loaded TLS certificates for http and transport layer.
     """
-    url = f"https://{unit_ip}:9200/_plugins/_security/api/ssl/certs"
-    admin_secret = await get_secret_by_label(ops_test, "wazuh-indexer:app:app-admin")
+    return await _fetch_loaded_tls_certificates(ops_test, unit_ip, session)
 
-    with open("admin.cert", "w") as cert:
-        cert.write(admin_secret["cert"])
 
-    with open("admin.key", "w") as key:
-        key.write(admin_secret["key"])
+def _certificates_renewed(current_certs: Dict, updated_certs: Dict) -> bool:
+    """Whether both the transport and http certificates are newer than the current ones."""
+    return all(
+        updated_certs[certs_list][0]["not_before"] > current_certs[certs_list][0]["not_before"]
+        for certs_list in ("transport_certificates_list", "http_certificates_list")
+    )
 
-    response = requests.get(url, cert=("admin.cert", "admin.key"), verify=False)
-    return response.json()
+
+async def wait_for_cert_renewal(
+    ops_test: OpsTest,
+    unit_ip: str,
+    current_certs: Dict,
+    timeout: float,
+    initial_interval: float = 10,
+    max_interval: float = 30,
+    session: Optional[requests.Session] = None,
+) -> Dict:
+    """Poll the loaded TLS certificates until both layers were renewed, or the timeout is hit.
+
+    Args:
+        ops_test: The ops test framework instance.
+        unit_ip: The ip of the unit of the OpenSearch unit.
+        current_certs: The certificates loaded before the renewal, as returned by
+            get_loaded_tls_certificates.
+        timeout: Seconds to wait for the renewal.
+        initial_interval: Seconds to wait before the first check, doubled after each check.
+        max_interval: Upper bound, in seconds, of the wait between two checks.
+        session: a session to reuse, a new one if not set.
+
+    Returns:
+        The renewed certificates, or the last ones loaded (at worst current_certs) once the
+        timeout is hit, for the caller to assert on.
+    """
+    deadline = time.monotonic() + timeout
+    interval = initial_interval
+    updated_certs = current_certs
+    while (remaining := deadline - time.monotonic()) > 0:
+        await asyncio.sleep(min(interval, remaining))
+        interval = min(2 * interval, max_interval)
+        try:
+            # a single fetch per poll, bounded by the time left, so the timeout holds
+            certs = await asyncio.wait_for(
+                _fetch_loaded_tls_certificates(ops_test, unit_ip, session),
+                max(deadline - time.monotonic(), 1),
+            )
+            renewed = _certificates_renewed(current_certs, certs)
+        except (
+            asyncio.TimeoutError,
+            requests.RequestException,
+            ValueError,
+            KeyError,
+            IndexError,
+        ) as e:
+            # the certificates may be reloading, or the API briefly unavailable
+            logger.debug(f"Loaded certificates not available yet: {e}")
+            continue
+
+        updated_certs = certs
+        if renewed:
+            break
+
+    return updated_certs
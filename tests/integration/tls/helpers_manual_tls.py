@@ -79,6 +79,8 @@ class ManualTLSAgent:
         self.tls_unit = tls_unit
         self.ca_key = generate_private_key()
         self.ca = generate_ca(self.ca_key, "CN_CA")
+        # the CA never changes, encode it once rather than for every CSR
+        self.ca_b64 = base64.b64encode(self.ca).decode()
         self.csr_queue: list[CSR] = []
 
     async def get_outstanding_certificate_requests(self) -> None:
@@ -151,7 +153,7 @@ class ManualTLSAgent:
             relation_id=csr.relation_id,
             **{
                 "certificate": base64.b64encode(certificate).decode(),
-                "ca-certificate": base64.b64encode(self.ca).decode(),
+                "ca-certificate": self.ca_b64,
                 "certificate-signing-request": base64.b64encode(
                     csr.csr,
                 ).decode(),
@@ -16,6 +16,7 @@ from ..helpers import (
     IDLE_PERIOD,
     MODEL_CONFIG,
     UNIT_IDS,
+    forget_admin_secrets,
     get_leader_unit_ip,
     get_secret_by_label,
 )
@@ -190,6 +191,8 @@ async def test_rollout_new_ca(ops_test: OpsTest, deploy_type) -> None:
                 timeout=2400,
                 idle_period=IDLE_PERIOD,
             )
+        # the CA chain cached before the rollout is stale now
+        forget_admin_secrets(ops_test)
 
         # Check if the continuous-writes client works with the new certs as well
         with open(ContinuousWrites.CERT_PATH, "r") as f:
@@ -2,11 +2,13 @@
 # Copyright 2024 Canonical Ltd.
 # See LICENSE file for licensing details.
 
+import asyncio
 import logging
-import subprocess
-import time
+from typing import Dict, Tuple
 
 import pytest
+import requests
+from charms.opensearch.v0.constants_charm import TLSRelationMissing
 from pytest_operator.plugin import OpsTest
 
 from ..helpers import (
@@ -16,6 +18,7 @@ from ..helpers import (
     UNIT_IDS,
     check_cluster_formation_successful,
     cluster_health,
+    forget_admin_secrets,
     get_application_unit_ids,
     get_application_unit_ids_ips,
     get_application_unit_ips_names,
@@ -29,6 +32,7 @@ from ..tls.helpers import (
     check_security_index_initialised,
     check_unit_tls_configured,
     get_loaded_tls_certificates,
+    wait_for_cert_renewal,
 )
 
 logger = logging.getLogger(__name__)
@@ -42,6 +46,18 @@ SECRET_EXPIRY_TIME = 180
 SECRET_EXPIRY_WAIT_TIME = SECRET_EXPIRY_TIME + 60
 
 
+@pytest.fixture(scope="module")
+async def leader(ops_test: OpsTest) -> Tuple[int, str]:
+    """ID and IP of the leader unit, until test_tls_expiration redeploys the application."""
+    return await asyncio.gather(get_leader_unit_id(ops_test), get_leader_unit_ip(ops_test))
+
+
+@pytest.fixture(scope="module")
+async def unit_ids_ips(ops_test: OpsTest) -> Dict[int, str]:
+    """IPs of the units keyed by their ID, until test_tls_expiration redeploys the application."""
+    return await get_application_unit_ids_ips(ops_test, APP_NAME)
+
+
 @pytest.mark.abort_on_fail
 @pytest.mark.skip_if_deployed
 async def test_build_and_deploy_active(ops_test: OpsTest, charm, series) -> None:
@@ -75,41 +91,55 @@ async def test_build_and_deploy_active(ops_test: OpsTest, charm, series) -> None
 
 
 @pytest.mark.abort_on_fail
-async def test_security_index_initialised(ops_test: OpsTest) -> None:
+async def test_security_index_initialised(
+    ops_test: OpsTest, leader: Tuple[int, str], http_session: requests.Session
+) -> None:
     """Test that the security index is well initialised."""
     # Wait for the leader unit to initialize the security index.
-    leader_unit_ip = await get_leader_unit_ip(ops_test)
-    assert await check_security_index_initialised(ops_test, leader_unit_ip)
+    _, leader_unit_ip = leader
+    assert await check_security_index_initialised(ops_test, leader_unit_ip, http_session)
 
 
 @pytest.mark.abort_on_fail
-async def test_tls_configured(ops_test: OpsTest) -> None:
+async def test_tls_configured(ops_test: OpsTest, http_session: requests.Session) -> None:
     """Test that TLS is enabled when relating to the TLS Certificates Operator."""
-    for unit_name, unit_ip in (await get_application_unit_ips_names(ops_test)).items():
-        assert await check_unit_tls_configured(ops_test, unit_ip, unit_name)
+    units = await get_application_unit_ips_names(ops_test)
+    # each check is retried on its own, so a unit still reloading does not fail the others
+    results = await asyncio.gather(
+        *(
+            check_unit_tls_configured(ops_test, unit_ip, unit_name, http_session)
+            for unit_name, unit_ip in units.items()
+        )
+    )
+    assert all(results)
 
 
 @pytest.mark.abort_on_fail
-async def test_cluster_formation_after_tls(ops_test: OpsTest) -> None:
+async def test_cluster_formation_after_tls(
+    ops_test: OpsTest, leader: Tuple[int, str], http_session: requests.Session
+) -> None:
     """Test that the cluster formation is successful after TLS setup."""
     unit_names = get_application_unit_names(ops_test)
-    leader_unit_ip = await get_leader_unit_ip(ops_test)
+    _, leader_unit_ip = leader
 
-    assert await check_cluster_formation_successful(ops_test, leader_unit_ip, unit_names)
+    assert await check_cluster_formation_successful(
+        ops_test, leader_unit_ip, unit_names, http_session
+    )
 
 
 @pytest.mark.abort_on_fail
-async def test_tls_renewal(ops_test: OpsTest) -> None:
+async def test_tls_renewal(
+    ops_test: OpsTest,
+    leader: Tuple[int, str],
+    unit_ids_ips: Dict[int, str],
+    http_session: requests.Session,
+) -> None:
     """Test that renewed TLS certificates are reloaded immediately without restarting."""
-    leader_unit_ip = await get_leader_unit_ip(ops_test)
-    leader_id = await get_leader_unit_id(ops_test)
-    non_leader_id = [
-        unit_id for unit_id in get_application_unit_ids(ops_test) if unit_id != leader_id
-    ][0]
-    units = await get_application_unit_ids_ips(ops_test, APP_NAME)
+    leader_id, leader_unit_ip = leader
+    non_leader_id = [unit_id for unit_id in unit_ids_ips if unit_id != leader_id][0]
 
     # test against the leader unit for unit-transport cert
-    current_certs = await get_loaded_tls_certificates(ops_test, leader_unit_ip)
+    current_certs = await get_loaded_tls_certificates(ops_test, leader_unit_ip, http_session)
     await run_action(
         ops_test, leader_id, "set-tls-private-key", params={"category": "unit-transport"}
     )
@@ -124,14 +154,16 @@ async def test_tls_renewal(ops_test: OpsTest) -> None:
         timeout=60,
     )
 
-    updated_certs = await get_loaded_tls_certificates(ops_test, leader_unit_ip)
+    updated_certs = await get_loaded_tls_certificates(ops_test, leader_unit_ip, http_session)
     assert (
         updated_certs["transport_certificates_list"][0]["not_before"]
         > current_certs["transport_certificates_list"][0]["not_before"]
     )
 
     # test against a random non-leader unit for unit-http cert
-    current_certs = await get_loaded_tls_certificates(ops_test, units[non_leader_id])
+    current_certs = await get_loaded_tls_certificates(
+        ops_test, unit_ids_ips[non_leader_id], http_session
+    )
     await run_action(
         ops_test,
         non_leader_id,
@@ -149,7 +181,9 @@ async def test_tls_renewal(ops_test: OpsTest) -> None:
         timeout=30,
     )
 
-    updated_certs = await get_loaded_tls_certificates(ops_test, units[non_leader_id])
+    updated_certs = await get_loaded_tls_certificates(
+        ops_test, unit_ids_ips[non_leader_id], http_session
+    )
     assert (
         updated_certs["http_certificates_list"][0]["not_before"]
         > current_certs["http_certificates_list"][0]["not_before"]
@@ -157,40 +191,45 @@ async def test_tls_renewal(ops_test: OpsTest) -> None:
 
 
 @pytest.mark.abort_on_fail
-async def test_tls_expiration(ops_test: OpsTest, charm, series) -> None:
+async def test_tls_expiration(
+    ops_test: OpsTest, charm, series, http_session: requests.Session
+) -> None:
     """Test that expiring TLS certificates are renewed."""
     # before we can run this test, need to clean up and deploy with different config
-    if APP_NAME in ops_test.model.applications:
-        logger.info(f"Removing application {APP_NAME}")
-        await ops_test.model.remove_application(APP_NAME, block_until_done=True)
-    if TLS_CERTIFICATES_APP_NAME in ops_test.model.applications:
-        logger.info(f"Removing application {TLS_CERTIFICATES_APP_NAME}")
-        await ops_test.model.remove_application(TLS_CERTIFICATES_APP_NAME, block_until_done=True)
-
-    # Deploy TLS Certificates operator
-    logger.info("Deploying TLS Certificates operator")
-    config = {"ca-common-name": "CN_CA", "certificate-validity": "1"}
-    await ops_test.model.deploy(
-        TLS_CERTIFICATES_APP_NAME, channel=TLS_STABLE_CHANNEL, config=config
+    deployed_apps = [
+        app for app in (APP_NAME, TLS_CERTIFICATES_APP_NAME) if app in ops_test.model.applications
+    ]
+    logger.info(f"Removing applications {deployed_apps}")
+    await asyncio.gather(
+        *(ops_test.model.remove_application(app, block_until_done=True) for app in deployed_apps)
     )
-    await wait_until(ops_test, apps=[TLS_CERTIFICATES_APP_NAME], apps_statuses=["active"])
+    forget_admin_secrets(ops_test)
 
-    # Deploy Opensearch operator
     await ops_test.model.set_config(MODEL_CONFIG)
 
-    logger.info("Deploying OpenSearch")
-    await ops_test.model.deploy(
-        charm,
-        num_units=1,
-        series=series,
-        config=CONFIG_OPTS,
+    # Deploy the TLS Certificates and OpenSearch operators, not related yet
+    logger.info("Deploying TLS Certificates operator and OpenSearch")
+    config = {"ca-common-name": "CN_CA", "certificate-validity": "1"}
+    await asyncio.gather(
+        ops_test.model.deploy(
+            TLS_CERTIFICATES_APP_NAME, channel=TLS_STABLE_CHANNEL, config=config
+        ),
+        ops_test.model.deploy(
+            charm,
+            num_units=1,
+            series=series,
+            config=CONFIG_OPTS,
+        ),
     )
 
     await wait_until(
         ops_test,
-        apps=[APP_NAME],
-        units_statuses=["blocked"],
-        wait_for_exact_units=1,
+        apps=[TLS_CERTIFICATES_APP_NAME, APP_NAME],
+        apps_full_statuses={
+            TLS_CERTIFICATES_APP_NAME: {"active": []},
+            APP_NAME: {"blocked": [TLSRelationMissing]},
+        },
+        wait_for_exact_units={TLS_CERTIFICATES_APP_NAME: -1, APP_NAME: 1},
     )
 
     # Change the expiry time of the secret carrying the certificate to 3 minutes for testing
@@ -199,9 +238,11 @@ async def test_tls_expiration(ops_test: OpsTest, charm, series) -> None:
     search_expression = "expire=self._get_next_secret_expiry_time\\(certificate\\)"
     replace_expression = f"expire=timedelta\\(seconds={SECRET_EXPIRY_TIME}\\)"
     lib_file = f"/var/lib/juju/agents/unit-wazuh-indexer-{unit_id}/charm/lib/charms/tls_certificates_interface/v3/tls_certificates.py"
-    cmd = f"juju ssh {APP_NAME}/{unit_id} sudo sed -i 's/{search_expression}/{replace_expression}/g' {lib_file}"
-    logger.info(f"Running command: {cmd}")
-    subprocess.check_output(cmd, shell=True)
+    # the remote shell unescapes the expressions, as juju ssh joins its arguments
+    cmd = ["ssh", f"{APP_NAME}/{unit_id}", "sudo", "sed", "-i"]
+    cmd += [f"s/{search_expression}/{replace_expression}/g", lib_file]
+    logger.info(f"Running command: juju {' '.join(cmd)}")
+    await ops_test.juju(*cmd, check=True)
 
     # Relate OpenSearch to TLS and wait until all is settled
     logger.info("Integrating OpenSearch with TLS Certificates operator")
@@ -217,27 +258,37 @@ async def test_tls_expiration(ops_test: OpsTest, charm, series) -> None:
     # wait for the unit to be ready and API's available
     logger.info("Test cluster health")
     unit_ip = await get_leader_unit_ip(ops_test)
-    cluster_health_resp = await cluster_health(ops_test, unit_ip, wait_for_green_first=True)
+    cluster_health_resp = await cluster_health(
+        ops_test, unit_ip, wait_for_green_first=True, session=http_session
+    )
     assert cluster_health_resp["status"] == "green"
 
     # now start with the actual test
     # first get the currently used certs
-    current_certs = await get_loaded_tls_certificates(ops_test, unit_ip)
+    current_certs = await get_loaded_tls_certificates(ops_test, unit_ip, http_session)
 
-    # now wait for the expiration period to pass by (and a bit longer for things to settle)
+    # now wait for the certificates to expire and be renewed, at most the expiration period
+    # (and a bit longer for things to settle)
     # we can't use `wait_until` here because the unit might not be idle in the meantime
-    # please note: minimum waiting time is 60 minutes, due to limitations on the tls-operator
     logger.info(
-        f"Waiting for certificates to expire. Wait time: {SECRET_EXPIRY_WAIT_TIME / 60} minutes."
+        "Waiting for certificates to expire and be renewed. "
+        f"Max wait time: {SECRET_EXPIRY_WAIT_TIME / 60} minutes."
+    )
+    updated_certs = await wait_for_cert_renewal(
+        ops_test,
+        unit_ip,
+        current_certs,
+        timeout=SECRET_EXPIRY_WAIT_TIME,
+        session=http_session,
     )
-    time.sleep(SECRET_EXPIRY_WAIT_TIME)
 
     logger.info("Test cluster health after certificate expiry")
-    cluster_health_resp = await cluster_health(ops_test, unit_ip, wait_for_green_first=True)
+    cluster_health_resp = await cluster_health(
+        ops_test, unit_ip, wait_for_green_first=True, session=http_session
+    )
     assert cluster_health_resp["status"] == "green"
 
     # now compare the current certificates against the earlier ones and see if they were updated
-    updated_certs = await get_loaded_tls_certificates(ops_test, unit_ip)
     logger.info("Comparing certificates before and after expiry")
     logger.info(f"Certs: {current_certs}, {updated_certs}")
     assert (
@@ -23,9 +23,6 @@ OPENSEARCH_MAIN_APP_NAME = "main"
 OPENSEARCH_FAILOVER_APP_NAME = "failover"
 
 
-charm = None
-
-
 WORKLOAD = {
     APP_NAME: 3,
     OPENSEARCH_FAILOVER_APP_NAME: 2,
@@ -85,16 +82,18 @@ async def test_large_deployment_deploy_original_charm(ops_test: OpsTest, series)
     )
 
     # Large deployment setup
-    await ops_test.model.integrate("main:peer-cluster-orchestrator", "failover:peer-cluster")
-    await ops_test.model.integrate("main:peer-cluster-orchestrator", f"{APP_NAME}:peer-cluster")
-    await ops_test.model.integrate(
-        "failover:peer-cluster-orchestrator", f"{APP_NAME}:peer-cluster"
+    await asyncio.gather(
+        ops_test.model.integrate("main:peer-cluster-orchestrator", "failover:peer-cluster"),
+        ops_test.model.integrate("main:peer-cluster-orchestrator", f"{APP_NAME}:peer-cluster"),
+        ops_test.model.integrate("failover:peer-cluster-orchestrator", f"{APP_NAME}:peer-cluster"),
     )
 
     # TLS setup
-    await ops_test.model.integrate("main", TLS_CERTIFICATES_APP_NAME)
-    await ops_test.model.integrate("failover", TLS_CERTIFICATES_APP_NAME)
-    await ops_test.model.integrate(APP_NAME, TLS_CERTIFICATES_APP_NAME)
+    await asyncio.gather(
+        ops_test.model.integrate("main", TLS_CERTIFICATES_APP_NAME),
+        ops_test.model.integrate("failover", TLS_CERTIFICATES_APP_NAME),
+        ops_test.model.integrate(APP_NAME, TLS_CERTIFICATES_APP_NAME),
+    )
 
     # Charms except s3-integrator should be active
     await wait_until(
@@ -124,24 +123,24 @@ async def test_manually_upgrade_to_local(
     ops_test: OpsTest, c_writes: ContinuousWrites, c_writes_runner, charm
 ) -> None:
     """Test upgrade from usptream to currently locally built version."""
-    units = await get_application_units(ops_test, OPENSEARCH_MAIN_APP_NAME)
-    leader_id = [u.id for u in units if u.is_leader][0]
+    # refreshing an application does not move the leadership of the others
+    all_units = await asyncio.gather(*(get_application_units(ops_test, app) for app in WORKLOAD))
+    leader_ids = {
+        app: next(u.id for u in units if u.is_leader) for app, units in zip(WORKLOAD, all_units)
+    }
 
     action = await run_action(
         ops_test,
-        leader_id,
+        leader_ids[OPENSEARCH_MAIN_APP_NAME],
         "pre-upgrade-check",
         app=OPENSEARCH_MAIN_APP_NAME,
     )
     assert action.status == "completed"
 
-    logger.info("Build charm locally")
-
     async with ops_test.fast_forward():
         for app, unit_count in WORKLOAD.items():
             application = ops_test.model.applications[app]
-            units = await get_application_units(ops_test, app)
-            leader_id = [u.id for u in units if u.is_leader][0]
+            leader_id = leader_ids[app]
 
             logger.info(f"Refresh app {app}, leader {leader_id}")
 
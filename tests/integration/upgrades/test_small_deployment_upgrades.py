@@ -2,7 +2,9 @@
 # Copyright 2024 Canonical Ltd.
 # See LICENSE file for licensing details.
 
+import asyncio
 import logging
+from types import MappingProxyType
 
 import pytest
 from pytest_operator.plugin import OpsTest
@@ -26,29 +28,26 @@ PROFILES_REVISION = 185
 STARTING_VERSION = "4.11.0"
 
 
-VERSION_TO_REVISION = {
-    STARTING_VERSION: 5,
-}
+VERSION_TO_REVISION = MappingProxyType(
+    {
+        STARTING_VERSION: 5,
+    }
+)
 
 
 FROM_VERSION_PREFIX = "from_v{}_to_local"
 
 
-UPGRADE_INITIAL_VERSION = [
-    (
-        pytest.param(
-            version,
-            id=FROM_VERSION_PREFIX.format(version),
-            marks=pytest.mark.group(
-                id="two_version_upgrade" if version == STARTING_VERSION else "one_version_upgrade"
-            ),
-        )
+UPGRADE_INITIAL_VERSION = tuple(
+    pytest.param(
+        version,
+        id=FROM_VERSION_PREFIX.format(version),
+        marks=pytest.mark.group(
+            id="two_version_upgrade" if version == STARTING_VERSION else "one_version_upgrade"
+        ),
     )
-    for version in VERSION_TO_REVISION.keys()
-]
-
-
-charm = None
+    for version in VERSION_TO_REVISION
+)
 
 
 #######################################################################
@@ -59,30 +58,44 @@ charm = None
 
 
 async def _build_env(ops_test: OpsTest, version: str, series) -> None:
-    """Deploy OpenSearch cluster from a given revision."""
-    await ops_test.model.set_config(MODEL_CONFIG)
+    """Deploy OpenSearch cluster from a given revision, unless it is already running it."""
+    application = ops_test.model.applications.get(APP_NAME)
+    if (
+        application
+        and application.charm_url.endswith(f"-{VERSION_TO_REVISION[version]}")
+        and application.status == "active"
+    ):
+        # e.g. a rerun on a kept model, the cluster (and its watermark) is already set up
+        logger.info(f"{APP_NAME} already active at revision {VERSION_TO_REVISION[version]}")
+        return
 
-    await ops_test.model.deploy(
-        OPENSEARCH_ORIGINAL_CHARM_NAME,
-        application_name=APP_NAME,
-        num_units=3,
-        channel=OPENSEARCH_CHANNEL,
-        revision=VERSION_TO_REVISION[version],
-        series=series,
-        config=CONFIG_OPTS if VERSION_TO_REVISION[version] > PROFILES_REVISION else {},
-    )
+    await ops_test.model.set_config(MODEL_CONFIG)
 
-    # Deploy TLS Certificates operator.
+    # Deploy OpenSearch and the TLS Certificates operator.
     config = {"ca-common-name": "CN_CA"}
-    await ops_test.model.deploy(
-        TLS_CERTIFICATES_APP_NAME, channel=TLS_STABLE_CHANNEL, config=config
+    await asyncio.gather(
+        ops_test.model.deploy(
+            OPENSEARCH_ORIGINAL_CHARM_NAME,
+            application_name=APP_NAME,
+            num_units=3,
+            channel=OPENSEARCH_CHANNEL,
+            revision=VERSION_TO_REVISION[version],
+            series=series,
+            config=CONFIG_OPTS if VERSION_TO_REVISION[version] > PROFILES_REVISION else {},
+        ),
+        ops_test.model.deploy(
+            TLS_CERTIFICATES_APP_NAME, channel=TLS_STABLE_CHANNEL, config=config
+        ),
     )
 
     # Relate it to OpenSearch to set up TLS.
     await ops_test.model.integrate(APP_NAME, TLS_CERTIFICATES_APP_NAME)
-    await ops_test.model.wait_for_idle(
+    await wait_until(
+        ops_test,
         apps=[TLS_CERTIFICATES_APP_NAME, APP_NAME],
-        status="active",
+        apps_statuses=["active"],
+        units_statuses=["active"],
+        wait_for_exact_units={TLS_CERTIFICATES_APP_NAME: 1, APP_NAME: 3},
         timeout=1400,
         idle_period=50,
     )
@@ -221,8 +234,6 @@ async def test_upgrade_rollback_from_local(
     )
     assert action.status == "completed"
 
-    logger.info("Build charm locally")
-
     async with ops_test.fast_forward("60s"):
         logger.info("Refresh the charm")
         await refresh(ops_test, app, path=charm, config=CONFIG_OPTS)
@@ -4,11 +4,11 @@
 """Unit test for the opensearch_plugins library."""
 import unittest
 from collections import namedtuple
+from functools import cache
 from unittest.mock import MagicMock, PropertyMock, patch
 
 import charms
 import pytest
-import tenacity
 from charms.opensearch.v0.constants_charm import (
     S3_RELATION,
     BackupDeferRelBrokenAsInProgress,
@@ -48,7 +48,6 @@ from lib.charms.opensearch.v0.models import (
     StartMode,
     State,
 )
-from tests.helpers import patch_wait_fixed
 
 TEST_BUCKET_NAME = "s3://bucket-test"
 TEST_BASE_PATH = "/test"
@@ -61,10 +60,33 @@ LIST_BACKUPS_TRIAL = """ backup-id           | backup-status
 2023-01-01T00:20:00Z | snapshot in progress"""
 
 
+# cluster state where all the indices of the close_indices_if_needed cases are open
+ALL_INDICES_OPEN = {
+    "index1": {"status": IndexStateEnum.OPEN},
+    "index2": {"status": IndexStateEnum.OPEN},
+    "index3": {"status": IndexStateEnum.OPEN},
+}
+
+# response to closing index1 and index2 successfully
+INDICES_CLOSED_RESPONSE = {
+    "acknowledged": True,
+    "shards_acknowledged": True,
+    "indices": {
+        "index1": {
+            "closed": True,
+        },
+        "index2": {
+            "closed": True,
+        },
+    },
+}
+
+
 deployment_desc = namedtuple("deployment_desc", ["typ"])
 
 
-def create_deployment_desc(*args, **kwargs):
+@cache
+def _deployment_desc_template():
     return DeploymentDescription(
         config=PeerClusterConfig(
             cluster_name="logs",
@@ -81,6 +103,11 @@ def create_deployment_desc(*args, **kwargs):
     )
 
 
+def create_deployment_desc():
+    # the charm mutates the description in place, each harness gets its own copy
+    return _deployment_desc_template().copy(deep=True)
+
+
 @pytest.fixture(scope="module")
 def active_relation(relation: str = S3_RELATION):
     with patch(
@@ -91,6 +118,22 @@ def active_relation(relation: str = S3_RELATION):
         yield mock
 
 
+@pytest.fixture(scope="module", autouse=True)
+def exposed_plugins():
+    """Override the ConfigExposedPlugins for the tests of this module only."""
+    with patch(
+        "charms.opensearch.v0.opensearch_plugin_manager.ConfigExposedPlugins",
+        {
+            "repository-s3": {
+                "class": OpenSearchS3Plugin,
+                "config": None,
+                "relation": "s3-credentials",
+            },
+        },
+    ) as mock:
+        yield mock
+
+
 @pytest.fixture(scope="function")
 def harness(active_relation):
     harness_obj = Harness(OpenSearchOperatorCharm)
@@ -103,20 +146,8 @@ def harness(active_relation):
         # Override the config to simulate the TestPlugin
         # As config.yml does not exist, the setup below simulates it
         charm.plugin_manager._charm_config = harness_obj.model._config
-        # Override the ConfigExposedPlugins
-        charms.opensearch.v0.opensearch_plugin_manager.ConfigExposedPlugins = {
-            "repository-s3": {
-                "class": OpenSearchS3Plugin,
-                "config": None,
-                "relation": "s3-credentials",
-            },
-        }
         charm.opensearch.is_started = MagicMock(return_value=True)
         charm.health.apply = MagicMock(return_value=HealthColors.GREEN)
-        # Mock retrials to speed up tests
-        charms.opensearch.v0.opensearch_backups.wait_fixed = MagicMock(
-            return_value=tenacity.wait.wait_fixed(0.1)
-        )
 
         # Replace some unused methods that will be called as part of set_leader with mock
         charm._put_admin_user = MagicMock()
@@ -136,54 +167,26 @@ def mock_request():
 
 
 @pytest.mark.parametrize(
-    "leader,request_value,result_value",
+    "request_value,result_value",
     [
-        # Test leader + request_value that should return True
-        (
-            False,
-            {
-                "index1": {"shards": [{"type": "SNAPSHOT", "stage": "DONE"}]},
-                "index2": {"shards": [{"type": "SNAPSHOT", "stage": "DONE"}]},
-            },
-            True,
-        ),
+        # Test request_value that should return True
         (
-            True,
             {
                 "index1": {"shards": [{"type": "SNAPSHOT", "stage": "DONE"}]},
                 "index2": {"shards": [{"type": "SNAPSHOT", "stage": "DONE"}]},
             },
             True,
         ),
-        # Test leader + request_value that should return False
-        (
-            False,
-            {
-                "index1": {"shards": [{"type": "SNAPSHOT", "stage": "DONE"}]},
-                "index2": {"shards": [{"type": "SNAPSHOT", "stage": "IN_PROGRESS"}]},
-            },
-            False,
-        ),
+        # Test request_value that should return False
         (
-            True,
             {
                 "index1": {"shards": [{"type": "SNAPSHOT", "stage": "DONE"}]},
                 "index2": {"shards": [{"type": "SNAPSHOT", "stage": "IN_PROGRESS"}]},
             },
             False,
         ),
-        # Test leader + request_value that should return True
-        (
-            False,
-            {
-                "index1": {"shards": [{"type": "SNAPSHOT", "stage": "DONE"}]},
-                "index2": {"shards": [{"type": "SNAPSHOT", "stage": "DONE"}]},
-                "index3": {"shards": [{"type": "NOT_SNAP", "stage": "DONE"}]},
-            },
-            True,
-        ),
+        # Test request_value that should return True
         (
-            True,
             {
                 "index1": {"shards": [{"type": "SNAPSHOT", "stage": "DONE"}]},
                 "index2": {"shards": [{"type": "SNAPSHOT", "stage": "DONE"}]},
@@ -191,18 +194,8 @@ def mock_request():
             },
             True,
         ),
-        # Test leader + request_value that should return False
+        # Test request_value that should return False
         (
-            False,
-            {
-                "index1": {"shards": [{"type": "SNAPSHOT", "stage": "DONE"}]},
-                "index2": {"shards": [{"type": "SNAPSHOT", "stage": "IN_PROGRESS"}]},
-                "index3": {"shards": [{"type": "NOT_SNAP", "stage": "DONE"}]},
-            },
-            False,
-        ),
-        (
-            True,
             {
                 "index1": {"shards": [{"type": "SNAPSHOT", "stage": "DONE"}]},
                 "index2": {"shards": [{"type": "SNAPSHOT", "stage": "IN_PROGRESS"}]},
@@ -212,10 +205,12 @@ def mock_request():
         ),
     ],
 )
-def test_restore_finished_true(harness, mock_request, leader, request_value, result_value):
-    harness.charm.backup.charm.unit.is_leader = MagicMock(return_value=leader)
+def test_restore_finished_true(harness, mock_request, request_value, result_value):
     mock_request.return_value = request_value
-    assert harness.charm.backup.backup_manager.is_restore_in_progress() != result_value
+    # the result must not depend on leadership, check both on the same harness
+    for leader in (False, True):
+        harness.charm.backup.charm.unit.is_leader = MagicMock(return_value=leader)
+        assert harness.charm.backup.backup_manager.is_restore_in_progress() != result_value
 
 
 @pytest.mark.parametrize(
@@ -224,23 +219,8 @@ def test_restore_finished_true(harness, mock_request, leader, request_value, res
         # Check if only indices in backup-id=1 are closed
         (
             {1: {"indices": ["index1", "index2"]}},
-            {
-                "index1": {"status": IndexStateEnum.OPEN},
-                "index2": {"status": IndexStateEnum.OPEN},
-                "index3": {"status": IndexStateEnum.OPEN},
-            },
-            {
-                "acknowledged": True,
-                "shards_acknowledged": True,
-                "indices": {
-                    "index1": {
-                        "closed": True,
-                    },
-                    "index2": {
-                        "closed": True,
-                    },
-                },  # represents the closed indices
-            },
+            ALL_INDICES_OPEN,
+            INDICES_CLOSED_RESPONSE,
             False,
         ),
         # Check if only indices in backup-id=1 are closed
@@ -249,23 +229,8 @@ def test_restore_finished_true(harness, mock_request, leader, request_value, res
                 1: {"indices": ["index1", "index2"]},
                 2: {"indices": ["index3"]},
             },
-            {
-                "index1": {"status": IndexStateEnum.OPEN},
-                "index2": {"status": IndexStateEnum.OPEN},
-                "index3": {"status": IndexStateEnum.OPEN},
-            },
-            {
-                "acknowledged": True,
-                "shards_acknowledged": True,
-                "indices": {
-                    "index1": {
-                        "closed": True,
-                    },
-                    "index2": {
-                        "closed": True,
-                    },
-                },  # represents the closed indices
-            },
+            ALL_INDICES_OPEN,
+            INDICES_CLOSED_RESPONSE,
             False,
         ),
         # Check if already closed indices are skipped
@@ -293,11 +258,7 @@ def test_restore_finished_true(harness, mock_request, leader, request_value, res
         # Represents an error where index2 is not closed
         (
             {1: {"indices": ["index1", "index2"]}},
-            {
-                "index1": {"status": IndexStateEnum.OPEN},
-                "index2": {"status": IndexStateEnum.OPEN},
-                "index3": {"status": IndexStateEnum.OPEN},
-            },
+            ALL_INDICES_OPEN,
             {
                 "acknowledged": True,
                 "shards_acknowledged": True,
@@ -315,22 +276,14 @@ def test_restore_finished_true(harness, mock_request, leader, request_value, res
         # Represents an error where request failed
         (
             {1: {"indices": ["index1", "index2"]}},
-            {
-                "index1": {"status": IndexStateEnum.OPEN},
-                "index2": {"status": IndexStateEnum.OPEN},
-                "index3": {"status": IndexStateEnum.OPEN},
-            },
+            ALL_INDICES_OPEN,
             {"acknowledged": True, "shards_acknowledged": True, "indices": {}},
             True,
         ),
         # Represents an error where request failed
         (
             {1: {"indices": ["index1", "index2"]}},
-            {
-                "index1": {"status": IndexStateEnum.OPEN},
-                "index2": {"status": IndexStateEnum.OPEN},
-                "index3": {"status": IndexStateEnum.OPEN},
-            },
+            ALL_INDICES_OPEN,
             {
                 "acknowledged": False,
             },
@@ -356,15 +309,18 @@ def test_close_indices_if_needed(
             for i in list_backup_response[1]["indices"]
             if (i in cluster_state.keys() and cluster_state[i]["status"] != IndexStateEnum.CLOSED)
         }
-        mock_request.assert_called_with(
-            "POST",
-            f"{','.join(idx)}/_close",
-            payload={
+        # the indices are joined from a set, compare them regardless of their order
+        (method, url), kwargs = mock_request.call_args
+        assert method == "POST"
+        assert url.endswith("/_close")
+        assert set(url.removesuffix("/_close").split(",")) == idx
+        assert kwargs == {
+            "payload": {
                 "ignore_unavailable": "true",
             },
-            retries=6,
-            timeout=10,
-        )
+            "retries": 6,
+            "timeout": 10,
+        }
 
 
 @pytest.mark.parametrize(
@@ -458,9 +414,8 @@ def test_on_s3_broken_steps(
 
 @patch(
     "charms.opensearch.v0.opensearch_base_charm.OpenSearchPeerClustersManager.deployment_desc",
-    return_value=create_deployment_desc(),
+    new_callable=lambda: MagicMock(return_value=create_deployment_desc()),
 )
-@patch_wait_fixed()
 class TestBackups(unittest.TestCase):
     maxDiff = None
 
@@ -483,20 +438,8 @@ class TestBackups(unittest.TestCase):
             # As config.yml does not exist, the setup below simulates it
             self.charm.plugin_manager._charm_config = self.harness.model._config
             self.plugin_manager = self.charm.plugin_manager
-            # Override the ConfigExposedPlugins
-            charms.opensearch.v0.opensearch_plugin_manager.ConfigExposedPlugins = {
-                "repository-s3": {
-                    "class": OpenSearchS3Plugin,
-                    "config": None,
-                    "relation": "s3-credentials",
-                },
-            }
             self.charm.opensearch.is_started = MagicMock(return_value=True)
             self.charm.health.apply = MagicMock(return_value=HealthColors.GREEN)
-            # Mock retrials to speed up tests
-            charms.opensearch.v0.opensearch_backups.wait_fixed = MagicMock(
-                return_value=tenacity.wait.wait_fixed(0.1)
-            )
             self.charm.status = MagicMock()
 
             # Replace some unused methods that will be called as part of set_leader with mock
@@ -597,6 +540,15 @@ class TestBackups(unittest.TestCase):
             }
         )
         backups = self.charm.backup.backup_manager.list_backups()
+        # check the listed data first, so a formatting regression does not hide a listing one
+        self.assertEqual(
+            backups,
+            {
+                "2023-01-01T00:00:00Z": {"state": "SUCCESS", "indices": []},
+                "2023-01-01T00:10:00Z": {"state": "FAILED", "indices": []},
+                "2023-01-01T00:20:00Z": {"state": "IN_PROGRESS", "indices": []},
+            },
+        )
         self.assertEqual(
             self.charm.backup._generate_backup_list_output(backups), LIST_BACKUPS_TRIAL
         )
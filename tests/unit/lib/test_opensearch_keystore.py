@@ -2,9 +2,8 @@
 # See LICENSE file for licensing details.
 
 """Unit test for the opensearch keystore library."""
-import os
 import unittest
-from unittest.mock import MagicMock, call
+from unittest.mock import MagicMock, call, patch
 
 from charms.opensearch.v0.opensearch_exceptions import OpenSearchCmdError
 from charms.opensearch.v0.opensearch_keystore import OpenSearchKeystoreError
@@ -24,26 +23,27 @@ class TestOpenSearchKeystore(unittest.TestCase):
         self.harness.begin()
         self.charm = self.harness.charm
         self.keystore = self.charm.plugin_manager._keystore
-        os.path.exists = MagicMock(return_value=True)
+        # the keystore file only exists on the snap, restore os.path.exists after each test
+        exists_patcher = patch(
+            "charms.opensearch.v0.opensearch_keystore.os.path.exists", return_value=True
+        )
+        exists_patcher.start()
+        self.addCleanup(exists_patcher.stop)
 
     def test_list_except_keystore_not_found(self):
         """Throws exception for missing file when calling list."""
-        self.charm.opensearch.run_bin = MagicMock(
-            side_effect=OpenSearchCmdError(
+
+        def run_bin(*args, **kwargs):
+            raise OpenSearchCmdError(
                 "ERROR: OpenSearch keystore not found at ["
                 "/snap/wazuh-indexer/current/config/opensearch.keystore]. "
                 "Use 'create' command to create one."
             )
-        )
-        succeeded = False
-        try:
+
+        self.charm.opensearch.run_bin = run_bin
+        with self.assertRaises(OpenSearchKeystoreError) as e:
             self.keystore.list
-        except OpenSearchKeystoreError as e:
-            assert "ERROR: OpenSearch keystore not found at [" in str(e)
-            succeeded = True
-        finally:
-            # We may reach this point because of another exception, check it:
-            assert succeeded is True
+        assert "ERROR: OpenSearch keystore not found at [" in str(e.exception)
 
     def test_keystore_list(self):
         """Tests opensearch-keystore list with real output."""
@@ -68,6 +68,10 @@ class TestOpenSearchPeerClustersManager(unittest.TestCase):
         PatchedUnit(name="wazuh-indexer/3"),
         PatchedUnit(name="wazuh-indexer/4"),
     ]
+    # node name and unit number of each patched unit
+    p_units_nodes = [
+        (unit.name.replace("/", "-"), int(unit.name.split("/")[-1])) for unit in p_units
+    ]
 
     @patch("charm.OpenSearchOperatorCharm._put_or_update_internal_user_leader")
     def setUp(self, _) -> None:
@@ -85,6 +89,18 @@ class TestOpenSearchPeerClustersManager(unittest.TestCase):
         self.opensearch.is_node_up = MagicMock(return_value=True)
         self.peer_cm = self.charm.opensearch_peer_cm
 
+    def _roles_ok_deployment_desc(self, app: App) -> DeploymentDescription:
+        """Active main orchestrator deployment, started with the roles_ok config."""
+        return DeploymentDescription(
+            config=self.user_configs["roles_ok"],
+            start=StartMode.WITH_PROVIDED_ROLES,
+            pending_directives=[],
+            app=app,
+            typ=DeploymentType.MAIN_ORCHESTRATOR,
+            state=DeploymentState(value=State.ACTIVE),
+            profile="production",
+        )
+
     @patch(f"{PEER_CLUSTERS_MANAGER}.deployment_desc")
     def test_can_start(self, deployment_desc):
         """Test the can_start logic."""
@@ -92,28 +108,30 @@ class TestOpenSearchPeerClustersManager(unittest.TestCase):
         self.assertFalse(self.peer_cm.can_start())
 
         # with different directives
+        deployment_desc = DeploymentDescription(
+            config=PeerClusterConfig(
+                cluster_name="logs",
+                init_hold=False,
+                roles=["cluster_manager", "data"],
+                profile="production",
+            ),
+            start=StartMode.WITH_PROVIDED_ROLES,
+            pending_directives=[],
+            app=App(model_uuid=self.charm.model.uuid, name=self.charm.app.name),
+            typ=DeploymentType.MAIN_ORCHESTRATOR,
+            state=DeploymentState(value=State.ACTIVE),
+            profile="production",
+        )
         for directives, expected in [
             ([], True),
             ([Directive.SHOW_STATUS], True),
             ([Directive.SHOW_STATUS, Directive.WAIT_FOR_PEER_CLUSTER_RELATION], False),
             ([Directive.INHERIT_CLUSTER_NAME], False),
         ]:
-            deployment_desc = DeploymentDescription(
-                config=PeerClusterConfig(
-                    cluster_name="logs",
-                    init_hold=False,
-                    roles=["cluster_manager", "data"],
-                    profile="production",
-                ),
-                start=StartMode.WITH_PROVIDED_ROLES,
-                pending_directives=directives,
-                app=App(model_uuid=self.charm.model.uuid, name=self.charm.app.name),
-                typ=DeploymentType.MAIN_ORCHESTRATOR,
-                state=DeploymentState(value=State.ACTIVE),
-                profile="production",
+            can_start = self.peer_cm.can_start(
+                deployment_desc.copy(update={"pending_directives": directives})
             )
-            can_start = self.peer_cm.can_start(deployment_desc)
-            self.assertEqual(can_start, expected)
+            self.assertEqual(can_start, expected, directives)
 
     @patch(f"{BASE_LIB_PATH}.models.PeerClusterApp.from_dict")
     @patch(f"{PEER_CLUSTERS_MANAGER}.deployment_desc")
@@ -127,34 +145,26 @@ class TestOpenSearchPeerClustersManager(unittest.TestCase):
             planned_units=app["planned_units"]
         )
 
-        deployment_desc.return_value = DeploymentDescription(
-            config=self.user_configs["roles_ok"],
-            start=StartMode.WITH_PROVIDED_ROLES,
-            pending_directives=[],
-            app=App(model_uuid=self.charm.model.uuid, name="logs"),
-            typ=DeploymentType.MAIN_ORCHESTRATOR,
-            state=DeploymentState(value=State.ACTIVE),
-            profile="production",
-        )
+        deployment_desc.return_value = self._roles_ok_deployment_desc(app)
         # mock unit count=0 to only account for nodes in nodes list for full_cluster_planned_units
         self.charm.app.planned_units = MagicMock(return_value=0)
         is_provider.return_value = True
         # large deployment with 3 cms, should not raise an exception
         nodes = [
             Node(
-                name=node.name.replace("/", "-"),
+                name=name,
                 roles=["cluster_manager"],
                 ip="1.1.1.1",
-                app=App(model_uuid=self.charm.model.uuid, name=app.name),
-                unit_number=int(node.name.split("/")[-1]),
+                app=app,
+                unit_number=unit_number,
             )
-            for node in self.p_units[0:3]
+            for name, unit_number in self.p_units_nodes[0:3]
         ] + [
             Node(
                 name="node",
                 roles=["data"],
                 ip="1.1.1.1",
-                app=App(model_uuid=self.charm.model.uuid, name=app.name),
+                app=app,
                 unit_number=3,
             )
         ]
@@ -169,19 +179,19 @@ class TestOpenSearchPeerClustersManager(unittest.TestCase):
         # large deployment with < 3 cms, should raise an exception on final unit
         nodes = [
             Node(
-                name=node.name.replace("/", "-"),
+                name=name,
                 roles=["cluster_manager"],
                 ip="1.1.1.1",
-                app=App(model_uuid=self.charm.model.uuid, name=app.name),
-                unit_number=int(node.name.split("/")[-1]),
+                app=app,
+                unit_number=unit_number,
             )
-            for node in self.p_units[0:2]
+            for name, unit_number in self.p_units_nodes[0:2]
         ] + [
             Node(
                 name="node",
                 roles=["data"],
                 ip="0.0.0.0",
-                app=App(model_uuid=self.charm.model.uuid, name="logs"),
+                app=app,
                 unit_number=2,
             )
         ]
@@ -208,15 +218,18 @@ class TestOpenSearchPeerClustersManager(unittest.TestCase):
         """Test the pre_validation of roles change."""
         get_relation.return_value.units = set(self.p_units)
 
-        deployment_desc.return_value = DeploymentDescription(
-            config=self.user_configs["roles_ok"],
-            start=StartMode.WITH_PROVIDED_ROLES,
-            pending_directives=[],
-            app=App(model_uuid=self.charm.model.uuid, name="logs"),
-            typ=DeploymentType.MAIN_ORCHESTRATOR,
-            state=DeploymentState(value=State.ACTIVE),
-            profile="production",
-        )
+        app = App(model_uuid=self.charm.model.uuid, name="logs")
+        deployment_desc.return_value = self._roles_ok_deployment_desc(app)
+        data_nodes = [
+            Node(
+                name=f"{name}.{app.short_id}",
+                roles=["data"],
+                ip="1.1.1.1",
+                app=app,
+                unit_number=unit_number,
+            )
+            for name, unit_number in self.p_units_nodes
+        ]
 
         alt_hosts.return_value = []
         try:
@@ -227,21 +240,12 @@ class TestOpenSearchPeerClustersManager(unittest.TestCase):
 
             # test on a multi clusters fleet - happy path
             is_peer_cluster_orchestrator_relation_set.return_value = True
-            nodes.return_value = [
-                Node(
-                    name=node.name.replace("/", "-") + f".{deployment_desc().app.short_id}",
-                    roles=["data"],
-                    ip="1.1.1.1",
-                    app=deployment_desc().app,
-                    unit_number=int(node.name.split("/")[-1]),
-                )
-                for node in self.p_units
-            ] + [
+            nodes.return_value = data_nodes + [
                 Node(
-                    name=f"node-5.{deployment_desc().app.short_id}",
+                    name=f"node-5.{app.short_id}",
                     roles=["data"],
                     ip="2.2.2.2",
-                    app=deployment_desc().app,
+                    app=app,
                     unit_number=5,
                 )
             ]
@@ -262,14 +266,5 @@ class TestOpenSearchPeerClustersManager(unittest.TestCase):
         with self.assertRaises(OpenSearchProvidedRolesException):
             # no other data nodes in cluster fleet
             is_peer_cluster_orchestrator_relation_set.return_value = True
-            nodes.return_value = [
-                Node(
-                    name=node.name.replace("/", "-") + f".{deployment_desc().app.short_id}",
-                    roles=["data"],
-                    ip="1.1.1.1",
-                    app=deployment_desc().app,
-                    unit_number=int(node.name.split("/")[-1]),
-                )
-                for node in self.p_units
-            ]
+            nodes.return_value = data_nodes
             self.peer_cm._pre_validate_roles_change(new_roles=["ml"], prev_roles=["data", "ml"])
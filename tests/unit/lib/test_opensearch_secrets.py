@@ -31,6 +31,15 @@ class TestOpenSearchSecrets(TestOpenSearchInternalData):
     Additionally, the class also highlights the difference introduced in SecretsDataStore
     """
 
+    @classmethod
+    def setUpClass(cls):
+        # patched once for the whole class, and restored for the modules running after it
+        from_environ_patcher = patch.object(
+            JujuVersion, "from_environ", MagicMock(return_value=JujuVersionMock())
+        )
+        from_environ_patcher.start()
+        cls.addClassCleanup(from_environ_patcher.stop)
+
     def setUp(self):
         self.harness = Harness(OpenSearchOperatorCharm)
         self.addCleanup(self.harness.cleanup)
@@ -44,8 +53,6 @@ class TestOpenSearchSecrets(TestOpenSearchInternalData):
         self.secrets = self.charm.secrets
         self.store = self.charm.secrets
 
-        JujuVersion.from_environ = MagicMock(return_value=JujuVersionMock())
-
         self.peers_rel_id = self.harness.add_relation(PeerRelationName, self.charm.app.name)
         self.lock_fallback_rel_id = self.harness.add_relation(
             NodeLockRelationName, self.charm.app.name
@@ -96,6 +96,8 @@ class TestOpenSearchPlugin(unittest.TestCase):
     BASE_LIB_PATH = "charms.opensearch.v0"
 
     def setUp(self) -> None:
+        # stop the ConfigExposedPlugins patches, started here and in some tests, after each test
+        self.addCleanup(patch.stopall)
         self.patcher1 = patch(
             "charms.opensearch.v0.opensearch_plugin_manager.ConfigExposedPlugins",
             new_callable=PropertyMock(